@@ -520,7 +520,7 @@ static int upisnd_element_attr_write_str(upisnd_element_attr_e attr, upisnd_elem
 	size_t n = strlen(s);
 
 	errno = err = 0;
-	if (lseek(fd, 0, SEEK_SET) < 0 || write(fd, s, n) < 0 || fdatasync(fd) < 0)
+	if (pwrite(fd, s, n, 0) < 0)
 		err = errno;
 
 	close(fd);
@@ -656,7 +656,7 @@ int upisnd_value_read(int fd)
 	char value[16];
 	errno = 0;
 	int n;
-	if (lseek(fd, 0, SEEK_SET) < 0 || (n = read(fd, value, 15)) < 0)
+	if ((n = pread(fd, value, 15, 0)) < 0)
 		return -1;
 	value[n] = '\0';
 
@@ -668,7 +668,8 @@ int upisnd_value_write(int fd, int value)
 	char s[16];
 	int n = sprintf(s, "%d", value);
 	errno = 0;
-	if (lseek(fd, 0, SEEK_SET) < 0 || write(fd, s, n) < 0 || fdatasync(fd) < 0)
+	// sysfs writes take effect synchronously in the driver's store callback, fdatasync would be a no-op syscall.
+	if (pwrite(fd, s, n, 0) < 0)
 		return -1;
 
 	return n;
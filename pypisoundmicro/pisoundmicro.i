@@ -91,6 +91,110 @@
 
 #define SWIG_FILE_WITH_INIT
 #include <pisound-micro.h>
+
+#include <fcntl.h>
+#include <string.h>
+#include <errno.h>
+#include <limits.h>
+#include <stdint.h>
+
+// Reads consecutive values from fd into every item of a writable buffer of uint16 (H), int16 (h) or int (i) items.
+// Raises OverflowError if a value does not fit the item type.
+// Returns the number of values read, or NULL with a Python exception set.
+static PyObject *upisnd_value_read_into(int fd, PyObject *buffer)
+{
+	Py_buffer view;
+	if (PyObject_GetBuffer(buffer, &view, PyBUF_CONTIG | PyBUF_FORMAT) != 0)
+		return NULL;
+
+	const char *fmt = view.format ? view.format : "B";
+	size_t fmt_len = strlen(fmt);
+	char code = fmt_len != 0 ? fmt[fmt_len-1] : '\0';
+	int min_value, max_value;
+	if (code == 'H' && view.itemsize == sizeof(uint16_t))
+	{
+		min_value = 0;
+		max_value = UINT16_MAX;
+	}
+	else if (code == 'h' && view.itemsize == sizeof(int16_t))
+	{
+		min_value = INT16_MIN;
+		max_value = INT16_MAX;
+	}
+	else if (code == 'i' && view.itemsize == sizeof(int))
+	{
+		min_value = INT_MIN;
+		max_value = INT_MAX;
+	}
+	else
+	{
+		PyBuffer_Release(&view);
+		PyErr_SetString(PyExc_TypeError, "buffer must hold 16-bit or int items (format 'H', 'h' or 'i')");
+		return NULL;
+	}
+
+	Py_ssize_t n = view.len / view.itemsize;
+	Py_ssize_t i;
+	int err = 0;
+	int value = 0;
+
+	Py_BEGIN_ALLOW_THREADS
+	for (i=0; i<n; ++i)
+	{
+		value = upisnd_value_read(fd);
+		if (errno != 0)
+		{
+			err = errno;
+			break;
+		}
+		if (value < min_value || value > max_value)
+		{
+			err = ERANGE;
+			break;
+		}
+		switch (code)
+		{
+		case 'H': ((uint16_t*)view.buf)[i] = (uint16_t)value; break;
+		case 'h': ((int16_t*)view.buf)[i] = (int16_t)value; break;
+		default:  ((int*)view.buf)[i] = value; break;
+		}
+	}
+	Py_END_ALLOW_THREADS
+
+	PyBuffer_Release(&view);
+
+	if (err == ERANGE)
+	{
+		return PyErr_Format(PyExc_OverflowError, "value %d does not fit buffer format '%c'", value, code);
+	}
+	else if (err != 0)
+	{
+		errno = err;
+		return PyErr_SetFromErrno(PyExc_OSError);
+	}
+
+	return PyLong_FromSsize_t(n);
+}
+
+// Copies the contents of a bytes-like object over a plain C struct of the given size.
+// Returns None, or NULL with a Python exception set.
+static PyObject *upisnd_struct_set_data(void *dst, size_t size, PyObject *data)
+{
+	Py_buffer view;
+	if (PyObject_GetBuffer(data, &view, PyBUF_SIMPLE) != 0)
+		return NULL;
+
+	if ((size_t)view.len != size)
+	{
+		PyErr_Format(PyExc_ValueError, "Expected %zu bytes, got %zd", size, view.len);
+		PyBuffer_Release(&view);
+		return NULL;
+	}
+
+	memcpy(dst, view.buf, size);
+	PyBuffer_Release(&view);
+	Py_RETURN_NONE;
+}
 %}
 
 %include <stdint.i>
@@ -120,6 +224,53 @@
 	upisnd::Activity* as_activity() {
 		return new upisnd::Activity(self->as<upisnd::Activity>());
 	}
+
+	/// Returns the (name, type, pin) tuple of the element in a single call.
+	PyObject* snapshot() const {
+		return Py_BuildValue("(zii)", self->getName(), (int)self->getType(), (int)self->getPin());
+	}
+}
+
+%extend upisnd::AnalogInput {
+	/// Reads consecutive values into a writable buffer of 'H', 'h' or 'i' items, opening the value fd only once.
+	PyObject* readInto(PyObject *buffer) const {
+		upisnd::ValueFd fd = self->openValueFd(O_RDONLY | O_CLOEXEC);
+		if (!fd.isValid())
+			return PyErr_SetFromErrno(PyExc_OSError);
+		return upisnd_value_read_into(fd.get(), buffer);
+	}
+}
+
+%extend upisnd::ValueFd {
+	/// Reads consecutive values into a writable buffer of 'H', 'h' or 'i' items.
+	PyObject* readInto(PyObject *buffer) const {
+		return upisnd_value_read_into(self->get(), buffer);
+	}
+}
+
+// Copy the raw memory of the options structs in and out, for to_bytes, from_bytes and unpack.
+%extend upisnd_analog_input_opts_t {
+	/// Returns a copy of the raw struct memory.
+	PyObject* data() const {
+		return PyBytes_FromStringAndSize((const char*)self, sizeof(*self));
+	}
+
+	/// Overwrites the raw struct memory, `data` must be exactly the size of the struct.
+	PyObject* setData(PyObject *data) {
+		return upisnd_struct_set_data(self, sizeof(*self), data);
+	}
+}
+
+%extend upisnd_encoder_opts_t {
+	/// Returns a copy of the raw struct memory.
+	PyObject* data() const {
+		return PyBytes_FromStringAndSize((const char*)self, sizeof(*self));
+	}
+
+	/// Overwrites the raw struct memory, `data` must be exactly the size of the struct.
+	PyObject* setData(PyObject *data) {
+		return upisnd_struct_set_data(self, sizeof(*self), data);
+	}
 }
 
 // Typemap for ValueFd::read(int *err) to return a tuple (value, error)
@@ -137,6 +288,107 @@
 
 %include <pisound-micro.h>
 
+%inline %{
+/// Sets both the input and value ranges of the Analog Input options in a single call.
+void upisnd_analog_input_opts_set_ranges(upisnd_analog_input_opts_t *opts, int input_low, int input_high, int value_low, int value_high)
+{
+	opts->input_range.low = input_low;
+	opts->input_range.high = input_high;
+	opts->value_range.low = value_low;
+	opts->value_range.high = value_high;
+}
+
+/// Sets both the input and value ranges of the Encoder options in a single call.
+void upisnd_encoder_opts_set_ranges(upisnd_encoder_opts_t *opts, int input_low, int input_high, int value_low, int value_high)
+{
+	opts->input_range.low = input_low;
+	opts->input_range.high = input_high;
+	opts->value_range.low = value_low;
+	opts->value_range.high = value_high;
+}
+
+/// Fills in all of the Encoder options fields in a single call.
+void upisnd_encoder_opts_init(upisnd_encoder_opts_t *opts, int input_low, int input_high, int value_low, int value_high, int value_mode)
+{
+	upisnd_encoder_opts_set_ranges(opts, input_low, input_high, value_low, value_high);
+	opts->value_mode = (upisnd_value_mode_e)value_mode;
+}
+
+/// Reads the current value of every fd in the `fds` sequence into the matching item of a writable int buffer.
+/// The GIL is released while reading. Returns the number of values read, or raises OSError.
+PyObject *upisnd_value_read_batch(PyObject *fds, PyObject *buffer)
+{
+	PyObject *seq = PySequence_Fast(fds, "fds must be a sequence of file descriptors");
+	if (!seq)
+		return NULL;
+
+	Py_buffer view;
+	if (PyObject_GetBuffer(buffer, &view, PyBUF_CONTIG | PyBUF_FORMAT) != 0)
+	{
+		Py_DECREF(seq);
+		return NULL;
+	}
+
+	Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+	const char *fmt = view.format ? view.format : "B";
+	size_t fmt_len = strlen(fmt);
+	if (view.itemsize != sizeof(int) || fmt_len == 0 || fmt[fmt_len-1] != 'i')
+	{
+		PyErr_SetString(PyExc_TypeError, "buffer must hold signed int items (format 'i')");
+		goto error;
+	}
+	if (view.len / view.itemsize < n)
+	{
+		PyErr_SetString(PyExc_ValueError, "buffer is too small for the number of fds");
+		goto error;
+	}
+
+	{
+		int *out = (int*)view.buf;
+		PyObject **items = PySequence_Fast_ITEMS(seq);
+		Py_ssize_t i;
+
+		// Convert the fds in place, the values are then overwritten by the read results.
+		for (i=0; i<n; ++i)
+		{
+			out[i] = PyLong_AsLong(items[i]);
+			if (out[i] == -1 && PyErr_Occurred())
+				goto error;
+		}
+
+		int err = 0;
+		Py_BEGIN_ALLOW_THREADS
+		for (i=0; i<n; ++i)
+		{
+			int value = upisnd_value_read(out[i]);
+			if (errno != 0)
+			{
+				err = errno;
+				break;
+			}
+			out[i] = value;
+		}
+		Py_END_ALLOW_THREADS
+
+		if (err != 0)
+		{
+			errno = err;
+			PyErr_SetFromErrno(PyExc_OSError);
+			goto error;
+		}
+	}
+
+	PyBuffer_Release(&view);
+	Py_DECREF(seq);
+	return PyLong_FromSsize_t(n);
+
+error:
+	PyBuffer_Release(&view);
+	Py_DECREF(seq);
+	return NULL;
+}
+%}
+
 %pythoncode %{
 import atexit
 from threading import Lock
@@ -144,22 +396,26 @@ from threading import Lock
 _upisnd_mutex = Lock()
 
 _upisnd_initializer = None
+_upisnd_atexit_registered = False
 
 def _init():
-	global _upisnd_initializer
+	global _upisnd_initializer, _upisnd_atexit_registered
+	if _upisnd_initializer is not None:
+		return
 	with _upisnd_mutex:
 		if _upisnd_initializer is None:
 			_upisnd_initializer = LibInitializer()
+			if not _upisnd_atexit_registered:
+				# Register the cleanup function to be called on normal interpreter shutdown.
+				atexit.register(_cleanup)
+				_upisnd_atexit_registered = True
 
 def _cleanup():
 	global _upisnd_initializer
+	if _upisnd_initializer is None:
+		return
 	with _upisnd_mutex:
 		if _upisnd_initializer is not None:
 			del _upisnd_initializer
 			_upisnd_initializer = None
-
-# Register the cleanup function to be called on normal interpreter shutdown.
-atexit.register(_cleanup)
-
-_init()
 %}
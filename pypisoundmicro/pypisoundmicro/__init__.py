@@ -1,23 +1,57 @@
-from .element import Element
-from .name import ElementName
-from .analoginput import AnalogInput
-from .activity import Activity
-from .encoder import Encoder
-from .gpio import Gpio
-from .types import ActivityType, ElementType, Pin, PinDirection, PinPull, Range, ValueMode
-from .setup import Setup
-from .valuefd import ValueFd
+import importlib
+from typing import TYPE_CHECKING
 
-from .swig.pypisoundmicro import _init, _cleanup
+if TYPE_CHECKING:
+	from .element import Element
+	from .name import ElementName
+	from .analoginput import AnalogInput
+	from .activity import Activity
+	from .encoder import Encoder
+	from .gpio import Gpio
+	from .types import ActivityType, ElementType, Pin, PinDirection, PinPull, Range, ValueMode
+	from .setup import Setup
+	from .valuefd import ValueFd
+
+# The public classes are imported from their modules on first access, so
+# scripts only pay for the parts of the package they actually use.
+_LAZY_ATTRS = {
+	'Element': '.element',
+	'ElementName': '.name',
+	'AnalogInput': '.analoginput',
+	'Activity': '.activity',
+	'Encoder': '.encoder',
+	'Gpio': '.gpio',
+	'ActivityType': '.types',
+	'ElementType': '.types',
+	'Pin': '.types',
+	'PinDirection': '.types',
+	'PinPull': '.types',
+	'Range': '.types',
+	'ValueMode': '.types',
+	'Setup': '.setup',
+	'ValueFd': '.valuefd',
+}
+
+def __getattr__(name: str):
+	module_name = _LAZY_ATTRS.get(name)
+	if module_name is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(importlib.import_module(module_name, __name__), name)
+	globals()[name] = value
+	return value
+
+def __dir__():
+	return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 def init() -> None:
 	"""
 	Initialize libpisoundmicro resources.
 	
 	This function initializes the libpisoundmicro library and prepares it
-	for use. It is automatically called when the module is imported, but you can
-	call it explicitly if needed, in case you have used cleanup explicitly and need
-	to reinitialize the library.
+	for use. It is automatically called the first time an element is set up or
+	looked up, but you can call it explicitly if you want to pay the initialization
+	cost up front, or in case you have used cleanup explicitly and need to
+	reinitialize the library.
 	
 	Thread-safe:
 		This function is thread-safe and can be called from any thread.
@@ -27,6 +61,7 @@ def init() -> None:
 		
 		psm.init()
 	"""
+	from .swig.pypisoundmicro import _init
 	_init()
 
 def cleanup() -> None:
@@ -37,8 +72,8 @@ def cleanup() -> None:
 	released, including any remaining elements and the global initializer.
 	
 	Note:
-		This function is automatically registered with atexit when the module
-		is imported, so resources will be cleaned up during normal program
+		This function is automatically registered with atexit when the library
+		is first initialized, so resources will be cleaned up during normal program
 		termination. However, for abnormal terminations (e.g., when signals
 		are received), your main script should call this function explicitly
 		in its signal handlers.
@@ -65,6 +100,7 @@ def cleanup() -> None:
 		signal.signal(signal.SIGTERM, signal_handler)  # Termination signal
 		```
 	"""
+	from .swig.pypisoundmicro import _cleanup
 	_cleanup()
 
 __all__ = [
@@ -1,5 +1,11 @@
+import os
+
+_NO_DOCS = os.environ.get('PYPISOUNDMICRO_NO_DOCS') == '1'
+
 def copy_doc(from_func):
 	def decorator(to_func):
+		if _NO_DOCS:
+			return to_func
 		to_func.__doc__ = from_func.__doc__
 		return to_func
 	return decorator
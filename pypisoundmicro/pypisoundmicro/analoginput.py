@@ -1,8 +1,14 @@
+import struct
+from array import array
 from ._utils import copy_doc
 from .swig import pypisoundmicro as psm
-from typing import Self, Type, Optional, Union
+from typing import Self, Tuple, Type, Optional, Union
 from .types import Pin, Range
-from . import Element, ElementName
+from .element import Element
+from .name import ElementName, _coerce_name
+
+# Layout of upisnd_analog_input_opts_t, in native byte order.
+_ANALOG_INPUT_OPTS_STRUCT = struct.Struct('=iiii')
 
 class AnalogInputOpts:
 	"""
@@ -12,6 +18,8 @@ class AnalogInputOpts:
 	options for configuring input and value ranges.
 	"""
 
+	__slots__ = ('_opts', '_input_range_cache', '_value_range_cache')
+
 	def __init__(self, input_range: Range = None, value_range: Range = None) -> None:
 		"""
 		Initialize AnalogInputOpts with input and value ranges.
@@ -20,44 +28,115 @@ class AnalogInputOpts:
 			input_range: Range object for input values
 			value_range: Range object for output values
 		"""
-		self._opts = psm.upisnd_analog_input_opts_t()
-		
 		# Default ranges
 		if input_range is None:
 			input_range = Range(0, 1023)
 		if value_range is None:
 			value_range = Range(0, 1023)
-			
-		self.input_range = input_range
-		self.value_range = value_range
+
+		self._opts = psm.upisnd_analog_input_opts_t()
+		self.set_ranges(input_range.low, input_range.high, value_range.low, value_range.high)
+
+	@classmethod
+	def from_values(cls, input_low: int, input_high: int, value_low: int, value_high: int) -> Self:
+		"""
+		Create AnalogInputOpts from plain integers, filling the C struct in a single native call.
+
+		Args:
+			input_low: The lower bound of the input range
+			input_high: The upper bound of the input range
+			value_low: The lower bound of the value range
+			value_high: The upper bound of the value range
+
+		Returns:
+			The new AnalogInputOpts instance.
+		"""
+		result = cls.__new__(cls)
+		result._opts = psm.upisnd_analog_input_opts_t()
+		result.set_ranges(input_low, input_high, value_low, value_high)
+		return result
 
 	@property
 	def input_range(self) -> Range:
 		"""Get the current input range."""
-		return Range(self._opts.input_range.low, self._opts.input_range.high)
+		if self._input_range_cache is None:
+			self.unpack()
+		return self._input_range_cache
 
 	@input_range.setter
 	def input_range(self, value: Range) -> None:
 		"""Set the input range."""
-		self._opts.input_range.low = value.low
-		self._opts.input_range.high = value.high
+		other = self.value_range
+		self.set_ranges(value.low, value.high, other.low, other.high)
 
 	@property
 	def value_range(self) -> Range:
 		"""Get the current value range."""
-		return Range(self._opts.value_range.low, self._opts.value_range.high)
+		if self._value_range_cache is None:
+			self.unpack()
+		return self._value_range_cache
 
 	@value_range.setter
 	def value_range(self, value: Range) -> None:
 		"""Set the value range."""
-		self._opts.value_range.low = value.low
-		self._opts.value_range.high = value.high
+		other = self.input_range
+		self.set_ranges(other.low, other.high, value.low, value.high)
+
+	def set_ranges(self, input_low: int, input_high: int, value_low: int, value_high: int) -> None:
+		"""
+		Set both the input and value ranges in a single native call.
+
+		Args:
+			input_low: The lower bound of the input range
+			input_high: The upper bound of the input range
+			value_low: The lower bound of the value range
+			value_high: The upper bound of the value range
+		"""
+		psm.upisnd_analog_input_opts_set_ranges(self._opts, input_low, input_high, value_low, value_high)
+		self._input_range_cache = Range(input_low, input_high)
+		self._value_range_cache = Range(value_low, value_high)
+
+	def unpack(self) -> Tuple[int, int, int, int]:
+		"""
+		Read all of the fields of the C struct at once.
+
+		Returns:
+			The (input_low, input_high, value_low, value_high) tuple.
+		"""
+		values = _ANALOG_INPUT_OPTS_STRUCT.unpack(self._opts.data())
+		self._input_range_cache = Range(values[0], values[1])
+		self._value_range_cache = Range(values[2], values[3])
+		return values
+
+	def to_bytes(self) -> bytes:
+		"""Get a copy of the raw C struct memory."""
+		return self._opts.data()
+
+	@classmethod
+	def from_bytes(cls, data: bytes) -> Self:
+		"""
+		Create AnalogInputOpts from the raw C struct memory, as returned by `to_bytes`.
+
+		Args:
+			data: The raw struct bytes
+
+		Returns:
+			The new AnalogInputOpts instance.
+
+		Raises:
+			ValueError: If `data` is not the size of the C struct.
+		"""
+		opts = psm.upisnd_analog_input_opts_t()
+		opts.setData(data)
+		return cls.from_c_opts(opts)
 
 	@classmethod
 	def from_c_opts(cls, opts: psm.upisnd_analog_input_opts_t) -> Self:
 		"""Create AnalogInputOpts from a C struct."""
-		result = cls()
+		result = cls.__new__(cls)
 		result._opts = opts
+		result._input_range_cache = None
+		result._value_range_cache = None
 		return result
 
 	def to_c_opts(self) -> psm.upisnd_analog_input_opts_t:
@@ -66,13 +145,22 @@ class AnalogInputOpts:
 
 @copy_doc(psm.AnalogInput)
 class AnalogInput(Element):
+	__slots__ = ('_stream_buf',)
+
+	def __init__(self, native_obj: Optional[psm.AnalogInput] = None) -> None:
+		"""Initialize an AnalogInput.
+
+		Args:
+			native_obj: The native SWIG-wrapped AnalogInput object
+		"""
+		super().__init__(native_obj)
+		self._stream_buf = None
+
 	@classmethod
 	@copy_doc(psm.AnalogInput.setup)
 	def setup(cls: Type[Self], name: Union[str, ElementName, psm.ElementName], pin: Pin) -> Self:
-		if isinstance(name, str):
-			name = psm.ElementName.regular(name)
-		elif isinstance(name, ElementName):
-			name = name._name
+		psm._init()
+		name = _coerce_name(name)
 		native_obj = psm.AnalogInput.setup(name, pin)
 		return cls(native_obj)
 
@@ -80,6 +168,54 @@ class AnalogInput(Element):
 	def get_value(self) -> int:
 		return self._native_obj.get()
 
+	def read_into(self, buffer) -> int:
+		"""Read consecutive values into a writable buffer.
+
+		The value fd is opened once for the whole batch, instead of once per
+		value as with get_value(), and no Python objects are created per value.
+
+		Example:
+			```py3
+			from array import array
+
+			samples = array('H', bytes(2 * 256))
+			adc.read_into(samples)
+			```
+
+		Args:
+			buffer: A writable, contiguous buffer of `'H'`, `'h'` or `'i'` items, such as
+				`array.array('H')` or a numpy `uint16`, `int16` or `int32` array. 16-bit
+				buffers only fit the default value range, use `'i'` if the value range
+				set through set_opts() may go outside of it
+
+		Returns:
+			The number of values read, which is the length of the buffer
+
+		Raises:
+			OverflowError: If a value does not fit the item type of the buffer
+			OSError: If reading the value fails
+		"""
+		return self._native_obj.readInto(buffer)
+
+	def stream(self, n: int) -> memoryview:
+		"""Read n consecutive values through a value fd kept open on this object.
+
+		Both the value fd and the sample buffer are reused between calls, so
+		repeated calls with the same n don't open any files or allocate. The
+		fd is closed by release().
+
+		Args:
+			n: The number of values to read
+
+		Returns:
+			A memoryview of int items, overwritten by the next call
+		"""
+		buf = self._stream_buf
+		if buf is None or len(buf) != n:
+			buf = self._stream_buf = array('i', bytes(array('i').itemsize * n))
+		self._cached_value_fd().read_into(buf)
+		return memoryview(buf)
+
 	@copy_doc(psm.AnalogInput.setOpts)
 	def set_opts(self, opts: AnalogInputOpts) -> int:
 		return self._native_obj.setOpts(opts.to_c_opts())
@@ -0,0 +1,77 @@
+"""Bulk post-processing helpers for raw sample buffers.
+
+These functions operate on buffers filled by `AnalogInput.read_into` or
+`AnalogInput.stream` and require numpy. If numba is installed, the per-sample
+kernel is JIT compiled, otherwise an equivalent vectorized numpy
+implementation is used.
+"""
+
+import numpy as np
+
+from .types import ValueMode
+
+try:
+	from numba import njit
+except ImportError:
+	njit = None
+
+_CLAMP = int(ValueMode.CLAMP)
+
+def _scale_wrap_loop(raw, input_low, input_high, value_low, value_high, mode):
+	out = np.empty(raw.size, np.int32)
+	input_span = input_high - input_low
+	value_span = value_high - value_low
+	lo = min(value_low, value_high)
+	hi = max(value_low, value_high)
+	count = hi - lo + 1
+	for i in range(raw.size):
+		v = ((np.int64(raw[i]) - input_low) * value_span) // input_span + value_low
+		if mode == _CLAMP:
+			v = min(hi, max(lo, v))
+		else:
+			v = lo + (v - lo) % count
+		out[i] = v
+	return out
+
+def _scale_wrap_numpy(raw, input_low, input_high, value_low, value_high, mode):
+	input_span = input_high - input_low
+	value_span = value_high - value_low
+	lo = min(value_low, value_high)
+	hi = max(value_low, value_high)
+	v = ((raw.astype(np.int64) - input_low) * value_span) // input_span + value_low
+	if mode == _CLAMP:
+		np.clip(v, lo, hi, out=v)
+	else:
+		v = lo + (v - lo) % (hi - lo + 1)
+	return v.astype(np.int32)
+
+if njit is not None:
+	_scale_wrap_impl = njit(cache=True)(_scale_wrap_loop)
+else:
+	_scale_wrap_impl = _scale_wrap_numpy
+
+def scale_wrap(raw, input_low: int, input_high: int, value_low: int, value_high: int, mode: int = ValueMode.CLAMP) -> np.ndarray:
+	"""Map raw samples from the input range onto the value range.
+
+	Each sample is mapped as `(raw - input_low) * (value_high - value_low) //
+	(input_high - input_low) + value_low`, with `mode` applied to results
+	falling outside of the value range.
+
+	Args:
+		raw: Buffer of raw samples, e.g. an `array('H')` filled by `AnalogInput.read_into` or the `memoryview` returned by `AnalogInput.stream`.
+		input_low: The lower bound of the input range.
+		input_high: The upper bound of the input range.
+		value_low: The lower bound of the value range.
+		value_high: The upper bound of the value range.
+		mode: `ValueMode.CLAMP` to clamp out of range results, `ValueMode.WRAP` to wrap them around.
+
+	Returns:
+		A new int32 numpy array with the mapped values.
+
+	Raises:
+		ValueError: If the input range is empty.
+	"""
+	if input_high == input_low:
+		raise ValueError("Input range must not be empty")
+	raw = np.asarray(raw)
+	return _scale_wrap_impl(raw, int(input_low), int(input_high), int(value_low), int(value_high), int(mode))
@@ -1,14 +1,19 @@
 from .swig import pypisoundmicro as psm
 from ._utils import copy_doc
-from typing import Optional, Self, Type, Union
-from .name import ElementName
-from .types import Pin, ElementType, PinDirection, PinPull, ActivityType
+from typing import Iterable, List, Optional, Self, Tuple, Type, Union
+from .name import ElementName, _coerce_name
+from .types import Pin, ElementType, PinDirection, PinPull, ActivityType, _to_element_type, _to_pin
 from .valuefd import ValueFd
+import importlib
 import os
+import select
+import weakref
 
 
 @copy_doc(psm.Element)
 class Element:
+	__slots__ = ('_native_obj', '_cached_name', '_cached_type', '_cached_pin', '_value_fd', '_finalizer', '__weakref__')
+
 	def __init__(self, native_obj: Optional[psm.Element] = None) -> None:
 		"""Initialize an Element.
 
@@ -19,41 +24,91 @@ class Element:
 		# This is necessary to ensure smooth cleanup on exit.
 		psm.upisnd_init()
 		self._native_obj = native_obj if native_obj is not None else psm.Element()
+		self._cached_name = None
+		self._cached_type = None
+		self._cached_pin = None
+		self._value_fd = None
+		# Releases the native element once this object is garbage collected, unless
+		# release() was called before. Garbage collection may be delayed, for example
+		# by reference cycles, so for deterministic cleanup, use the release() method
+		# explicitly or use the object as a context manager.
+		self._finalizer = weakref.finalize(self, _release_native, self._native_obj)
+
+	def _snapshot(self) -> None:
+		"""Fetch the name, type and pin of the element in a single native call.
+
+		These never change during the lifetime of the native element, so they
+		are cached until release().
+		"""
+		name, element_type, pin = self._native_obj.snapshot()
+		self._cached_name = name
+		self._cached_type = _to_element_type(element_type)
+		self._cached_pin = _to_pin(pin)
+
+	def _cached_value_fd(self) -> ValueFd:
+		"""Get a read-only value fd that is kept open until release()."""
+		if self._value_fd is None:
+			fd = self.open_value_fd(os.O_RDONLY | os.O_CLOEXEC)
+			if fd is None:
+				raise OSError(f"Failed to open value fd of element {self.name}")
+			self._value_fd = fd
+		return self._value_fd
+
+	def __bool__(self) -> bool:
+		"""Check whether the element is valid.
+
+		`if element:` is the cheapest way to check validity in tight loops,
+		`is_valid` is kept for readability and does the same check.
+		"""
+		native_obj = self._native_obj
+		return native_obj is not None and native_obj.isValid()
 
 	@property
 	@copy_doc(psm.Element.isValid)
 	def is_valid(self) -> bool:
-		if self._native_obj:
-			return self._native_obj.isValid()
-		return False
+		return self.__bool__()
 
 	@copy_doc(psm.Element.release)
 	def release(self) -> None:
-		if self._native_obj:
-			self._native_obj.release()
-			self._native_obj = None
-			# Decrement the reference counter of the native context.
-			psm.upisnd_uninit()
+		value_fd = self._value_fd
+		self._value_fd = None
+		try:
+			if value_fd is not None:
+				value_fd.close()
+		finally:
+			# Release the native element even if closing the value fd failed.
+			if self._native_obj is not None:
+				self._native_obj = None
+				self._finalizer()
+				self._cached_name = None
+				self._cached_type = None
+				self._cached_pin = None
 
 	@property
 	@copy_doc(psm.Element.getName)
 	def name(self) -> Optional[str]:
 		if self._native_obj:
-			return self._native_obj.getName()
+			if self._cached_type is None:
+				self._snapshot()
+			return self._cached_name
 		return None
 
 	@property
 	@copy_doc(psm.Element.getType)
 	def type(self) -> ElementType:
 		if self._native_obj:
-			return ElementType(self._native_obj.getType())
+			if self._cached_type is None:
+				self._snapshot()
+			return self._cached_type
 		return ElementType.INVALID
 
 	@property
 	@copy_doc(psm.Element.getPin)
 	def pin(self) -> Pin:
 		if self._native_obj:
-			return Pin(self._native_obj.getPin())
+			if self._cached_type is None:
+				self._snapshot()
+			return self._cached_pin
 		return Pin.INVALID
 
 	@copy_doc(psm.Element.openValueFd)
@@ -66,52 +121,82 @@ class Element:
 				return ValueFd(native_fd)
 		return None
 
+	@staticmethod
+	def poll(elements: Iterable['Element'], timeout: Optional[float] = None) -> List[Tuple['Element', int]]:
+		"""Wait for value changes of several elements at once.
+
+		A single poll() system call waits on the value fds of all the elements,
+		so the time spent waiting is that of the first change, rather than the
+		sum of waiting on each element in turn. The value fds are kept open on
+		the elements until they are released.
+
+		The first call after an element's value fd gets opened reports its
+		current value immediately.
+
+		Example:
+			```py3
+			while True:
+				for element, value in Element.poll([encoder, adc], timeout=1.0):
+					print(element.name, value)
+			```
+
+		Args:
+			elements: The elements to wait on
+			timeout: Maximum time to wait in seconds, None to wait indefinitely
+
+		Returns:
+			A list of (element, value) tuples for the elements that changed, empty on timeout
+		"""
+		poller = select.poll()
+		value_fds = {}
+		for element in elements:
+			fd = element._cached_value_fd()
+			value_fds[fd.get()] = (element, fd)
+			poller.register(fd.get(), select.POLLPRI | select.POLLERR)
+
+		events = poller.poll(None if timeout is None else timeout * 1000)
+
+		return [(element, fd.read()) for element, fd in (value_fds[raw_fd] for raw_fd, _ in events)]
+
+	def _cast(self, element_type: ElementType) -> Optional['Element']:
+		if self._native_obj and self.type == element_type:
+			native_cast, wrapper_class = _CAST_TABLE[element_type]
+			# Use the SWIG-provided as_* method that properly handles reference counting
+			swig_obj = native_cast(self._native_obj)
+			if swig_obj and swig_obj.isValid():
+				return _resolve_wrapper_class(wrapper_class)(swig_obj)
+		return None
+
+	def cast(self) -> Optional['Element']:
+		"""Cast the element to the class matching its type, such as Encoder or Gpio.
+
+		Returns None if the element is invalid or its type has no specific class.
+		"""
+		if self._native_obj and self.type in _CAST_TABLE:
+			return self._cast(self.type)
+		return None
+
 	def as_encoder(self) -> Optional['Encoder']:
 		"""Cast the element to an Encoder if possible."""
-		from .encoder import Encoder
-		if self._native_obj and self.type == ElementType.ENCODER:
-			# Use the SWIG-provided as_encoder method that properly handles reference counting
-			swig_encoder = self._native_obj.as_encoder()
-			if swig_encoder and swig_encoder.isValid():
-				return Encoder(swig_encoder)
-		return None
+		return self._cast(ElementType.ENCODER)
 
 	def as_analog_input(self) -> Optional['AnalogInput']:
 		"""Cast the element to an AnalogInput if possible."""
-		from .analoginput import AnalogInput
-		if self._native_obj and self.type == ElementType.ANALOG_INPUT:
-			# Use the SWIG-provided as_analog_input method that properly handles reference counting
-			swig_analog = self._native_obj.as_analog_input()
-			if swig_analog and swig_analog.isValid():
-				return AnalogInput(swig_analog)
-		return None
+		return self._cast(ElementType.ANALOG_INPUT)
 
 	def as_gpio(self) -> Optional['Gpio']:
 		"""Cast the element to a GPIO if possible."""
-		from .gpio import Gpio
-		if self._native_obj and self.type == ElementType.GPIO:
-			# Use the SWIG-provided as_gpio method that properly handles reference counting
-			swig_gpio = self._native_obj.as_gpio()
-			if swig_gpio and swig_gpio.isValid():
-				return Gpio(swig_gpio)
-		return None
+		return self._cast(ElementType.GPIO)
 
 	def as_activity(self) -> Optional['Activity']:
 		"""Cast the element to an Activity if possible."""
-		from .activity import Activity
-		if self._native_obj and self.type == ElementType.ACTIVITY:
-			# Use the SWIG-provided as_activity method that properly handles reference counting
-			swig_activity = self._native_obj.as_activity()
-			if swig_activity and swig_activity.isValid():
-				return Activity(swig_activity)
-		return None
+		return self._cast(ElementType.ACTIVITY)
 
 	@classmethod
 	@copy_doc(psm.Element.get)
 	def get(cls, name: Union[str, ElementName]) -> Optional[Self]:
-		if isinstance(name, str):
-			name = psm.ElementName.regular(name)
-
+		psm._init()
+		name = _coerce_name(name)
 		native_obj = psm.Element.get(name)
 		if native_obj.isValid():
 			return cls(native_obj)
@@ -120,16 +205,11 @@ class Element:
 	@classmethod
 	@copy_doc(psm.Element.setup)
 	def setup(cls, name: Union[str, ElementName], setup: Union[int, 'Setup']) -> Optional[Self]:
-		if isinstance(name, str):
-			name = psm.ElementName.regular(name)
-		
+		psm._init()
+		name = _coerce_name(name)
+
 		# Handle both raw integers and Setup objects
-		if hasattr(setup, 'to_int'):
-			setup_value = setup.to_int()
-		else:
-			setup_value = setup
-			
-		native_obj = psm.Element.setup(name, setup_value)
+		native_obj = psm.Element.setup(name, int(setup))
 		if native_obj.isValid():
 			return cls(native_obj)
 		return None
@@ -141,19 +221,27 @@ class Element:
 	def __exit__(self, exc_type, exc_val, exc_tb) -> None:
 		"""Context manager support for auto-releasing resources."""
 		self.release()
-		
-	def __del__(self) -> None:
-		"""Destructor to ensure resources are released.
-		
-		Note: This may not always be called immediately when the object goes out of scope,
-		especially if the object is part of a reference cycle. For deterministic cleanup,
-		use the release() method explicitly or use the object as a context manager.
-		"""
-		try:
-			# Check if _native_obj is still accessible
-			if hasattr(self, '_native_obj') and self._native_obj:
-				self.release()
-		except Exception:
-			# Silently ignore exceptions during garbage collection
-			# This prevents errors that would be swallowed by Python anyway
-			pass
+
+def _release_native(native_obj: psm.Element) -> None:
+	native_obj.release()
+	# Decrement the reference counter of the native context.
+	psm.upisnd_uninit()
+
+# Native cast method and wrapper class (as 'module.Class', imported on first
+# use to avoid circular imports) for each castable element type.
+_CAST_TABLE = {
+	ElementType.ENCODER:      (psm.Element.as_encoder,      'encoder.Encoder'),
+	ElementType.ANALOG_INPUT: (psm.Element.as_analog_input, 'analoginput.AnalogInput'),
+	ElementType.GPIO:         (psm.Element.as_gpio,         'gpio.Gpio'),
+	ElementType.ACTIVITY:     (psm.Element.as_activity,     'activity.Activity'),
+}
+
+_wrapper_classes = {}
+
+def _resolve_wrapper_class(path: str) -> Type[Element]:
+	cls = _wrapper_classes.get(path)
+	if cls is None:
+		module_name, class_name = path.rsplit('.', 1)
+		cls = getattr(importlib.import_module(f'.{module_name}', __package__), class_name)
+		_wrapper_classes[path] = cls
+	return cls
@@ -1,10 +1,15 @@
+import struct
 from ._utils import copy_doc
 from .swig import pypisoundmicro as psm
 from typing import Self, Type, Tuple, Optional, Literal, Union, overload
-from .types import Pin, Range, PinPull, ValueMode
-from . import Element, ElementName
+from .types import Pin, Range, PinPull, ValueMode, _to_pin, _to_pin_pull
+from .element import Element
+from .name import ElementName, _coerce_name
 
 
+# Layout of upisnd_encoder_opts_t, in native byte order.
+_ENCODER_OPTS_STRUCT = struct.Struct('=iiiii')
+
 class EncoderOpts:
 	"""
 	Wrapper for encoder options.
@@ -13,6 +18,8 @@ class EncoderOpts:
 	options for configuring input and value ranges and value mode.
 	"""
 
+	__slots__ = ('_opts', '_input_range_cache', '_value_range_cache')
+
 	def __init__(self, 
 				 input_range: Range = None, 
 				 value_range: Range = None,
@@ -25,39 +32,69 @@ class EncoderOpts:
 			value_range: Range object for output values
 			value_mode: Mode for handling values out of range (CLAMP or WRAP)
 		"""
-		self._opts = psm.upisnd_encoder_opts_t()
-		
 		# Default ranges
 		if input_range is None:
 			input_range = Range(0, 100)
 		if value_range is None:
 			value_range = Range(0, 100)
-			
-		self.input_range = input_range
-		self.value_range = value_range
-		self.value_mode = value_mode
+
+		self._init_opts(input_range.low, input_range.high, value_range.low, value_range.high, value_mode)
+
+	@classmethod
+	def from_values(cls,
+					input_low: int,
+					input_high: int,
+					value_low: int,
+					value_high: int,
+					value_mode: int = ValueMode.WRAP) -> Self:
+		"""
+		Create EncoderOpts from plain integers, filling the C struct in a single native call.
+
+		Args:
+			input_low: The lower bound of the input range
+			input_high: The upper bound of the input range
+			value_low: The lower bound of the value range
+			value_high: The upper bound of the value range
+			value_mode: Mode for handling values out of range (CLAMP or WRAP)
+
+		Returns:
+			The new EncoderOpts instance.
+		"""
+		result = cls.__new__(cls)
+		result._init_opts(input_low, input_high, value_low, value_high, value_mode)
+		return result
+
+	def _init_opts(self, input_low: int, input_high: int, value_low: int, value_high: int, value_mode: int) -> None:
+		self._opts = psm.upisnd_encoder_opts_t()
+		psm.upisnd_encoder_opts_init(self._opts, input_low, input_high, value_low, value_high, value_mode)
+		self._input_range_cache = Range(input_low, input_high)
+		self._value_range_cache = Range(value_low, value_high)
 
 	@property
 	def input_range(self) -> Range:
 		"""Get the current input range."""
-		return Range(self._opts.input_range.low, self._opts.input_range.high)
+		if self._input_range_cache is None:
+			self.unpack()
+		return self._input_range_cache
 
 	@input_range.setter
 	def input_range(self, value: Range) -> None:
 		"""Set the input range."""
-		self._opts.input_range.low = value.low
-		self._opts.input_range.high = value.high
+		other = self.value_range
+		self.set_ranges(value.low, value.high, other.low, other.high)
 
 	@property
 	def value_range(self) -> Range:
 		"""Get the current value range."""
-		return Range(self._opts.value_range.low, self._opts.value_range.high)
+		if self._value_range_cache is None:
+			self.unpack()
+		return self._value_range_cache
 
 	@value_range.setter
 	def value_range(self, value: Range) -> None:
 		"""Set the value range."""
-		self._opts.value_range.low = value.low
-		self._opts.value_range.high = value.high
+		other = self.input_range
+		self.set_ranges(other.low, other.high, value.low, value.high)
 
 	@property
 	def value_mode(self) -> int:
@@ -69,11 +106,76 @@ class EncoderOpts:
 		"""Set the value mode."""
 		self._opts.value_mode = mode
 
+	def set_ranges(self, input_low: int, input_high: int, value_low: int, value_high: int) -> None:
+		"""
+		Set both the input and value ranges in a single native call.
+
+		Args:
+			input_low: The lower bound of the input range
+			input_high: The upper bound of the input range
+			value_low: The lower bound of the value range
+			value_high: The upper bound of the value range
+		"""
+		psm.upisnd_encoder_opts_set_ranges(self._opts, input_low, input_high, value_low, value_high)
+		self._input_range_cache = Range(input_low, input_high)
+		self._value_range_cache = Range(value_low, value_high)
+
+	def pack(self, input_low: int, input_high: int, value_low: int, value_high: int, value_mode: int) -> None:
+		"""
+		Overwrite all of the fields of the C struct in a single native call.
+
+		Args:
+			input_low: The lower bound of the input range
+			input_high: The upper bound of the input range
+			value_low: The lower bound of the value range
+			value_high: The upper bound of the value range
+			value_mode: Mode for handling values out of range (CLAMP or WRAP)
+		"""
+		psm.upisnd_encoder_opts_init(self._opts, input_low, input_high, value_low, value_high, value_mode)
+		self._input_range_cache = Range(input_low, input_high)
+		self._value_range_cache = Range(value_low, value_high)
+
+	def unpack(self) -> Tuple[int, int, int, int, int]:
+		"""
+		Read all of the fields of the C struct at once.
+
+		Returns:
+			The (input_low, input_high, value_low, value_high, value_mode) tuple.
+		"""
+		values = _ENCODER_OPTS_STRUCT.unpack(self._opts.data())
+		self._input_range_cache = Range(values[0], values[1])
+		self._value_range_cache = Range(values[2], values[3])
+		return values
+
+	def to_bytes(self) -> bytes:
+		"""Get a copy of the raw C struct memory."""
+		return self._opts.data()
+
+	@classmethod
+	def from_bytes(cls, data: bytes) -> Self:
+		"""
+		Create EncoderOpts from the raw C struct memory, as returned by `to_bytes`.
+
+		Args:
+			data: The raw struct bytes
+
+		Returns:
+			The new EncoderOpts instance.
+
+		Raises:
+			ValueError: If `data` is not the size of the C struct.
+		"""
+		opts = psm.upisnd_encoder_opts_t()
+		opts.setData(data)
+		return cls.from_c_opts(opts)
+
 	@classmethod
 	def from_c_opts(cls, opts: psm.upisnd_encoder_opts_t) -> Self:
 		"""Create EncoderOpts from a C struct."""
-		result = cls()
+		result = cls.__new__(cls)
 		result._opts = opts
+		result._input_range_cache = None
+		result._value_range_cache = None
 		return result
 	
 	def to_c_opts(self) -> psm.upisnd_encoder_opts_t:
@@ -82,14 +184,14 @@ class EncoderOpts:
 
 @copy_doc(psm.Encoder)
 class Encoder(Element):
+	__slots__ = ()
+
 	@classmethod
 	@copy_doc(psm.Encoder.setup)
 	def setup(cls: Type[Self], name: Union[str, ElementName, psm.ElementName], pin_a: Pin, pull_a: PinPull, 
 			  pin_b: Pin, pull_b: PinPull) -> Self:
-		if isinstance(name, str):
-			name = psm.ElementName.regular(name)
-		elif isinstance(name, ElementName):
-			name = name._name
+		psm._init()
+		name = _coerce_name(name)
 		native_obj = psm.Encoder.setup(name, pin_a, pull_a, pin_b, pull_b)
 		return cls(native_obj)
 
@@ -111,12 +213,12 @@ class Encoder(Element):
 
 	@copy_doc(psm.Encoder.getPinB)
 	def get_pin_b(self) -> Pin:
-		return self._native_obj.getPinB()
+		return _to_pin(self._native_obj.getPinB())
 
 	@copy_doc(psm.Encoder.getPinPull)
 	def get_pin_pull(self) -> PinPull:
-		return self._native_obj.getPinPull()
+		return _to_pin_pull(self._native_obj.getPinPull())
 
 	@copy_doc(psm.Encoder.getPinBPull)
 	def get_pin_b_pull(self) -> PinPull:
-		return self._native_obj.getPinBPull()
+		return _to_pin_pull(self._native_obj.getPinBPull())
@@ -1,40 +1,39 @@
 from ._utils import copy_doc
-from . import Element, ElementName
+from .element import Element
+from .name import ElementName, _coerce_name
 from .swig import pypisoundmicro as psm
 from typing import Self, Type, Union
-from .types import PinDirection, PinPull
+from .types import PinDirection, PinPull, _to_pin_direction, _to_pin_pull
 
 @copy_doc(psm.Gpio)
 class Gpio(Element):
+	__slots__ = ()
+
 	@classmethod
 	@copy_doc(psm.Gpio.setupInput)
 	def setup_input(cls: Type[Self], name: Union[str, ElementName, psm.ElementName], pin: int, pull: PinPull) -> Self:
-		if isinstance(name, str):
-			name = psm.ElementName.regular(name)
-		elif isinstance(name, ElementName):
-			name = name._name
+		psm._init()
+		name = _coerce_name(name)
 		native_obj = psm.Gpio.setupInput(name, pin, pull)
 		return cls(native_obj)
 
 	@classmethod
 	@copy_doc(psm.Gpio.setupOutput)
 	def setup_output(cls: Type[Self], name: Union[str, ElementName, psm.ElementName], pin: int, high: int) -> Self:
-		if isinstance(name, str):
-			name = psm.ElementName.regular(name)
-		elif isinstance(name, ElementName):
-			name = name._name
+		psm._init()
+		name = _coerce_name(name)
 		native_obj = psm.Gpio.setupOutput(name, pin, high)
 		return cls(native_obj)
 
 	@property
 	@copy_doc(psm.Gpio.getDirection)
 	def direction(self) -> PinDirection:
-		return self._native_obj.getDirection()
+		return _to_pin_direction(self._native_obj.getDirection())
 
 	@property
 	@copy_doc(psm.Gpio.getPull)
 	def pull(self) -> PinPull:
-		return self._native_obj.getPull()
+		return _to_pin_pull(self._native_obj.getPull())
 
 	@copy_doc(psm.Gpio.get)
 	def get_value(self) -> int:
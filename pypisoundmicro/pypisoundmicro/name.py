@@ -1,11 +1,23 @@
 """Element naming utilities for the pypisoundmicro package."""
 
-from typing import Optional, Self
+from functools import lru_cache
+from typing import Optional, Self, Union
 from ._utils import copy_doc
 from .swig import pypisoundmicro as psm
 
+@lru_cache(maxsize=256)
+def _intern_name(name: str) -> psm.ElementName:
+	"""Convert a string to a native ElementName, reusing previous conversions.
+
+	The native ElementName is passed by value to the setup functions, so a
+	single instance can be safely shared between calls.
+	"""
+	return psm.ElementName.regular(name)
+
 @copy_doc(psm.ElementName)
 class ElementName:
+	__slots__ = ('_name',)
+
 	def __init__(self, name: str) -> None:
 		"""Initialize an ElementName from a string.
 		
@@ -44,6 +56,29 @@ class ElementName:
 	@classmethod
 	@copy_doc(psm.ElementName.randomized)
 	def randomized(cls, prefix: Optional[str] = None) -> Self:
+		psm._init()
 		result = cls.__new__(cls)
 		result._name = psm.ElementName.randomized(prefix)
-		return result
\ No newline at end of file
+		return result
+
+_NAME_COERCE = {
+	str: _intern_name,
+	ElementName: lambda name: name._name,
+	psm.ElementName: lambda name: name,
+}
+
+def _coerce_name(name: Union[str, ElementName, psm.ElementName]) -> psm.ElementName:
+	"""Convert any accepted element name representation to a native ElementName.
+
+	The conversion is picked by the exact type of `name`; subclasses fall back
+	to an isinstance check and get added to the table on first use.
+	"""
+	convert = _NAME_COERCE.get(type(name))
+	if convert is None:
+		for base, base_convert in tuple(_NAME_COERCE.items()):
+			if isinstance(name, base):
+				convert = _NAME_COERCE[type(name)] = base_convert
+				break
+		else:
+			raise TypeError(f"Expected str or ElementName, got {type(name).__name__}")
+	return convert(name)
@@ -1,11 +1,39 @@
 """Setup utilities for Element configuration in pypisoundmicro."""
 
+import errno
+import struct
 from ._utils import copy_doc
 from .swig import pypisoundmicro as psm
 from typing import Optional, Union, Self
 from .types import ElementType, Pin, PinDirection, PinPull, ActivityType
+from .types import _to_activity_type, _to_element_type, _to_pin, _to_pin_direction, _to_pin_pull
 from .name import ElementName
-from . import Element
+from .element import Element
+
+# Bit layout of upisnd_setup_t, as (shift, mask) pairs, matching the
+# UPISND_DEFINE_INTERNAL_SETUP_FIELD definitions in pisound-micro.c.
+# The getters decode the fields in Python instead of calling into the
+# native module, the setters still go through it for validation.
+_ELEMENT_TYPE_FIELD       = ( 0, 0x07)
+_PIN_ID_FIELD             = ( 3, 0xff)
+_GPIO_PULL_FIELD          = (11, 0x03)
+_GPIO_OUTPUT_FIELD        = (12, 0x01)
+_GPIO_DIR_FIELD           = (13, 0x01)
+_ENCODER_PIN_B_ID_FIELD   = (13, 0xff)
+_ENCODER_PIN_B_PULL_FIELD = (21, 0x03)
+_ACTIVITY_TYPE_FIELD      = (11, 0x03)
+
+# Serialized form of upisnd_setup_t.
+_SETUP_STRUCT = struct.Struct('<I')
+
+def _get_field(setup: int, field: tuple) -> int:
+	shift, mask = field
+	return (setup >> shift) & mask
+
+def _get_pin_field(setup: int, field: tuple) -> int:
+	# Pins are stored as int8_t.
+	value = _get_field(setup, field)
+	return value - 0x100 if value & 0x80 else value
 
 class Setup:
 	"""Wrapper for upisnd_setup_t type that encapsulates Element configuration.
@@ -14,6 +42,8 @@ class Setup:
 	that are passed to Element.setup() to create new elements.
 	"""
 
+	__slots__ = ('_setup',)
+
 	def __init__(self) -> None:
 		"""Initialize an empty Setup object."""
 		self._setup = 0  # The underlying C upisnd_setup_t is just a 32-bit integer
@@ -21,7 +51,7 @@ class Setup:
 	@property
 	@copy_doc(psm.upisnd_setup_get_element_type)
 	def element_type(self) -> ElementType:
-		return ElementType(psm.upisnd_setup_get_element_type(self._setup))
+		return _to_element_type(_get_field(self._setup, _ELEMENT_TYPE_FIELD))
 
 	@element_type.setter
 	@copy_doc(psm.upisnd_setup_set_element_type)
@@ -34,7 +64,9 @@ class Setup:
 	@property
 	@copy_doc(psm.upisnd_setup_get_pin_id)
 	def pin(self) -> Pin:
-		return Pin(psm.upisnd_setup_get_pin_id(self._setup))
+		if _get_field(self._setup, _ELEMENT_TYPE_FIELD) in (ElementType.ENCODER, ElementType.ANALOG_INPUT, ElementType.GPIO, ElementType.ACTIVITY):
+			return _to_pin(_get_pin_field(self._setup, _PIN_ID_FIELD))
+		return Pin.INVALID
 
 	@pin.setter
 	@copy_doc(psm.upisnd_setup_set_pin_id)
@@ -47,7 +79,9 @@ class Setup:
 	@property
 	@copy_doc(psm.upisnd_setup_get_gpio_dir)
 	def gpio_direction(self) -> PinDirection:
-		return PinDirection(psm.upisnd_setup_get_gpio_dir(self._setup))
+		if _get_field(self._setup, _ELEMENT_TYPE_FIELD) == ElementType.GPIO:
+			return _to_pin_direction(_get_field(self._setup, _GPIO_DIR_FIELD))
+		return PinDirection.INVALID
 
 	@gpio_direction.setter
 	@copy_doc(psm.upisnd_setup_set_gpio_dir)
@@ -60,7 +94,10 @@ class Setup:
 	@property
 	@copy_doc(psm.upisnd_setup_get_gpio_pull)
 	def gpio_pull(self) -> PinPull:
-		return PinPull(psm.upisnd_setup_get_gpio_pull(self._setup))
+		element_type = _get_field(self._setup, _ELEMENT_TYPE_FIELD)
+		if element_type == ElementType.ENCODER or (element_type == ElementType.GPIO and _get_field(self._setup, _GPIO_DIR_FIELD) == PinDirection.INPUT):
+			return _to_pin_pull(_get_field(self._setup, _GPIO_PULL_FIELD))
+		return PinPull.INVALID
 
 	@gpio_pull.setter
 	@copy_doc(psm.upisnd_setup_set_gpio_pull)
@@ -73,7 +110,9 @@ class Setup:
 	@property
 	@copy_doc(psm.upisnd_setup_get_gpio_output)
 	def gpio_output(self) -> int:
-		return psm.upisnd_setup_get_gpio_output(self._setup)
+		if _get_field(self._setup, _ELEMENT_TYPE_FIELD) == ElementType.GPIO and _get_field(self._setup, _GPIO_DIR_FIELD) == PinDirection.OUTPUT:
+			return _get_field(self._setup, _GPIO_OUTPUT_FIELD)
+		return -errno.EINVAL
 
 	@gpio_output.setter
 	@copy_doc(psm.upisnd_setup_set_gpio_output)
@@ -86,7 +125,9 @@ class Setup:
 	@property
 	@copy_doc(psm.upisnd_setup_get_encoder_pin_b_id)
 	def encoder_pin_b(self) -> Pin:
-		return Pin(psm.upisnd_setup_get_encoder_pin_b_id(self._setup))
+		if _get_field(self._setup, _ELEMENT_TYPE_FIELD) == ElementType.ENCODER:
+			return _to_pin(_get_pin_field(self._setup, _ENCODER_PIN_B_ID_FIELD))
+		return Pin.INVALID
 
 	@encoder_pin_b.setter
 	@copy_doc(psm.upisnd_setup_set_encoder_pin_b_id)
@@ -99,7 +140,9 @@ class Setup:
 	@property
 	@copy_doc(psm.upisnd_setup_get_encoder_pin_b_pull)
 	def encoder_pin_b_pull(self) -> PinPull:
-		return PinPull(psm.upisnd_setup_get_encoder_pin_b_pull(self._setup))
+		if _get_field(self._setup, _ELEMENT_TYPE_FIELD) == ElementType.ENCODER:
+			return _to_pin_pull(_get_field(self._setup, _ENCODER_PIN_B_PULL_FIELD))
+		return PinPull.INVALID
 
 	@encoder_pin_b_pull.setter
 	@copy_doc(psm.upisnd_setup_set_encoder_pin_b_pull)
@@ -112,7 +155,9 @@ class Setup:
 	@property
 	@copy_doc(psm.upisnd_setup_get_activity_type)
 	def activity_type(self) -> ActivityType:
-		return ActivityType(psm.upisnd_setup_get_activity_type(self._setup))
+		if _get_field(self._setup, _ELEMENT_TYPE_FIELD) == ElementType.ACTIVITY:
+			return _to_activity_type(_get_field(self._setup, _ACTIVITY_TYPE_FIELD))
+		return ActivityType.INVALID
 
 	@activity_type.setter
 	@copy_doc(psm.upisnd_setup_set_activity_type)
@@ -126,6 +171,26 @@ class Setup:
 		"""Get the raw setup integer value."""
 		return self._setup
 
+	def __int__(self) -> int:
+		"""Get the raw setup integer value, same as `to_int`."""
+		return self._setup
+
+	def to_bytes(self) -> bytes:
+		"""Serialize the setup value to 4 little-endian bytes."""
+		return _SETUP_STRUCT.pack(self._setup)
+
+	@classmethod
+	def from_bytes(cls, data: bytes) -> Self:
+		"""Create a Setup object from the output of to_bytes().
+
+		Args:
+			data: 4 bytes holding a little-endian upisnd_setup_t value
+
+		Returns:
+			A new Setup object initialized with the given setup value
+		"""
+		return cls.from_int(_SETUP_STRUCT.unpack(data)[0])
+
 	@classmethod
 	def from_int(cls, setup_int: int) -> Self:
 		"""Create a Setup object from an existing integer setup value.
@@ -1,21 +1,16 @@
 """Type definitions for the pypisoundmicro package."""
 
-from typing import Union, TypeVar
+from typing import NamedTuple, Union, TypeVar
 from enum import IntEnum, auto
 from .swig import pypisoundmicro as psm
 
 # Define type aliases for common types
-class Range:
+class Range(NamedTuple):
 	"""Range class with high and low properties for input and value ranges."""
-	def __init__(self, low: int = 0, high: int = 0):
-		"""Initialize a Range object.
-		
-		Args:
-			low: The lower bound of the range
-			high: The upper bound of the range
-		"""
-		self.low = low
-		self.high = high
+	low: int = 0
+	"""The lower bound of the range."""
+	high: int = 0
+	"""The upper bound of the range."""
 
 # Maximum element name length imported directly from the SWIG wrapper
 UPISND_MAX_ELEMENT_NAME_LENGTH = psm.UPISND_MAX_ELEMENT_NAME_LENGTH
@@ -108,3 +103,27 @@ class ValueMode(IntEnum):
 	"""The value is clamped to input_min and input_max range."""
 	WRAP = psm.UPISND_VALUE_MODE_WRAP
 	"""The value is wrapped over to the other boundary of the input range."""
+
+
+# Lookup tables for converting raw native values to enum members, avoiding
+# the overhead of IntEnum.__call__ on hot property accessors.
+_PIN_BY_INT = {p.value: p for p in Pin}
+_ELEMENT_TYPE_BY_INT = {t.value: t for t in ElementType}
+_PIN_PULL_BY_INT = {p.value: p for p in PinPull}
+_PIN_DIR_BY_INT = {d.value: d for d in PinDirection}
+_ACTIVITY_TYPE_BY_INT = {a.value: a for a in ActivityType}
+
+def _to_pin(value: int) -> Pin:
+	return _PIN_BY_INT.get(value, Pin.INVALID)
+
+def _to_element_type(value: int) -> ElementType:
+	return _ELEMENT_TYPE_BY_INT.get(value, ElementType.INVALID)
+
+def _to_pin_pull(value: int) -> PinPull:
+	return _PIN_PULL_BY_INT.get(value, PinPull.INVALID)
+
+def _to_pin_direction(value: int) -> PinDirection:
+	return _PIN_DIR_BY_INT.get(value, PinDirection.INVALID)
+
+def _to_activity_type(value: int) -> ActivityType:
+	return _ACTIVITY_TYPE_BY_INT.get(value, ActivityType.INVALID)
@@ -17,16 +17,37 @@
 #
 # You should have received a copy of the GNU Lesser General Public License along with libpisoundmicro. If not, see <https://www.gnu.org/licenses/>.
 
-import os
+import errno
+from array import array
+from collections import deque
 from .swig import pypisoundmicro as psm
 from ._utils import copy_doc
-from typing import Union
+from typing import Optional, Sequence, Union
+
+# Exact type -> conversion to the native ValueFd, subclasses are added on first use.
+_CTORS = {
+	psm.ValueFd: lambda fd: fd,
+	int: psm.ValueFd,
+}
+
+def _find_ctor(fd):
+	for base, ctor in tuple(_CTORS.items()):
+		if isinstance(fd, base):
+			_CTORS[type(fd)] = ctor
+			return ctor
+	raise TypeError("fd must be a psm.ValueFd or an int")
+
+# Closed shells of ValueFd objects created through ValueFd.acquire, ready for reuse.
+_POOL_SIZE = 32
+_pool = deque(maxlen=_POOL_SIZE)
 
 @copy_doc(psm.ValueFd)
 class ValueFd:
 	"""A wrapper around a file descriptor for reading/writing element values."""
 
-	_fd_obj: psm.ValueFd = None
+	__slots__ = ('_fd_obj', '_pooled')
+
+	_fd_obj: psm.ValueFd
 
 	def __init__(self, fd : Union[psm.ValueFd, int]):
 		"""Create a ValueFd from an existing file descriptor.
@@ -34,46 +55,107 @@ class ValueFd:
 		Args:
 			fd (int): The file descriptor to wrap
 		"""
-		if isinstance(fd, psm.ValueFd):
-			self._fd_obj = fd
-		elif isinstance(fd, int):
-			self._fd_obj = psm.ValueFd(fd)
-		else:
-			raise TypeError("fd must be a psm.ValueFd or an int")
+		try:
+			ctor = _CTORS[type(fd)]
+		except KeyError:
+			ctor = _find_ctor(fd)
+		self._fd_obj = ctor(fd)
+		self._pooled = False
+
+	@classmethod
+	def acquire(cls, fd : Union[psm.ValueFd, int]) -> 'ValueFd':
+		"""Get a ValueFd wrapping `fd`, reusing a previously closed one if available.
+
+		Once `close` is called, the object is returned to the pool and may be handed
+		out again by a later `acquire`, so it must not be used after closing.
+		This is useful for loops that repeatedly open and close value fds. Objects
+		collected without calling `close`, and instances of subclasses, are not pooled.
+
+		Args:
+			fd (int): The file descriptor to wrap
+		"""
+		try:
+			ctor = _CTORS[type(fd)]
+		except KeyError:
+			ctor = _find_ctor(fd)
+
+		shell = None
+		if cls is ValueFd:
+			try:
+				shell = _pool.pop()
+			except IndexError:
+				pass
+		if shell is None:
+			shell = cls.__new__(cls)
+
+		shell._fd_obj = ctor(fd)
+		# Subclass instances are never pooled, so a later acquire can't hand them out as a ValueFd.
+		shell._pooled = cls is ValueFd
+		return shell
 
 	def __del__(self):
 		"""Close the file descriptor when the object is garbage collected."""
-		self.close()
+		try:
+			self._close()
+		except AttributeError:
+			pass # __init__ did not complete, nothing to close.
 
 	@property
 	@copy_doc(psm.ValueFd.isValid)
 	def is_valid(self) -> bool:
-		return self._fd_obj.isValid() if self._fd_obj else False
+		fd_obj = self._fd_obj
+		return fd_obj.isValid() if fd_obj is not None else False
 
 	@copy_doc(psm.ValueFd.take)
 	def take(self) -> int:
-		if self._fd_obj is None:
+		fd_obj = self._fd_obj
+		if fd_obj is None:
 			return -1
 
-		fd = self._fd_obj.take()
+		fd = fd_obj.take()
 		self._fd_obj = None
 		return fd
 
 	@copy_doc(psm.ValueFd.get)
 	def get(self) -> int:
-		return self._fd_obj.get() if self._fd_obj else -1
+		fd_obj = self._fd_obj
+		return fd_obj.get() if fd_obj is not None else -1
 
-	@copy_doc(psm.ValueFd.close)
-	def close(self) -> None:
-		if hasattr(self, '_fd_obj') and self._fd_obj is not None:
-			err = self._fd_obj.close()
+	def _close(self) -> None:
+		fd_obj = self._fd_obj
+		if fd_obj is not None:
+			err = fd_obj.close()
 			if err != 0:
 				raise OSError(f"Failed to close file descriptor: {err}")
 			self._fd_obj = None
 
+	@copy_doc(psm.ValueFd.close)
+	def close(self) -> None:
+		self._close()
+		# Only an explicit close returns the object to the pool, __del__ must not resurrect it.
+		if self._pooled:
+			self._pooled = False
+			_pool.append(self)
+
 	@copy_doc(psm.ValueFd.write)
 	def write(self, value) -> int:
-		return self._fd_obj.write(value) if self._fd_obj else -1
+		fd_obj = self._fd_obj
+		return fd_obj.write(value) if fd_obj is not None else -1
+
+	def read_into(self, buffer) -> int:
+		"""
+		Reads consecutive values from the fd into a writable buffer.
+
+		:param buffer: A writable, contiguous buffer of `'H'`, `'h'` or `'i'` items, such as `array.array('i')`. 16-bit buffers only fit values within their range.
+		:raises OverflowError: If a value does not fit the item type of the buffer.
+		:raises OSError: If the file descriptor is invalid or if an error occurs during reading.
+		:return: The number of values read, which is the length of the buffer.
+		"""
+		fd_obj = self._fd_obj
+		if fd_obj is None:
+			raise OSError(errno.EBADF, "File descriptor is closed")
+
+		return fd_obj.readInto(buffer)
 
 	def read(self) -> int:
 		"""
@@ -82,11 +164,29 @@ class ValueFd:
 		:raises OSError: If the file descriptor is invalid or if an error occurs during reading.
 		:return: The read value.
 		"""
-		if self._fd_obj is None:
-			return (-1, os.EBADF)
+		fd_obj = self._fd_obj
+		if fd_obj is None:
+			raise OSError(errno.EBADF, "File descriptor is closed")
 
-		result, err = self._fd_obj.read()
+		result, err = fd_obj.read()
 		if err != 0:
 			raise OSError(f"Failed to read from file descriptor: {err}")
 
 		return result
+
+	@staticmethod
+	def read_batch(fds: Sequence['ValueFd'], out: Optional[array] = None) -> array:
+		"""
+		Reads the current value of each fd in a single native call, with the GIL released.
+
+		:param fds: The ValueFd objects to read.
+		:param out: Optional `array.array('i')` to store the values in, must be at least as long as `fds`.
+		:raises OSError: If any of the file descriptors is invalid or if an error occurs during reading.
+		:return: The array holding the read values, in the same order as `fds`.
+		"""
+		raw_fds = [fd.get() for fd in fds]
+		if out is None:
+			out = array('i', bytes(len(raw_fds) * array('i').itemsize))
+
+		psm.upisnd_value_read_batch(raw_fds, out)
+		return out
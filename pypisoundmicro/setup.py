@@ -10,27 +10,43 @@ import glob
 import importlib.util
 import shutil
 import ast
+from pathlib import Path
 
-# Find the library path
+# Find the library path, stopping at the first match within each search root
 lib_paths = []
 for search_path in ['../debian/tmp/usr/lib', '../debian/libpisoundmicro/usr/lib', '../']:
-	for lib_glob in glob.glob(f"{search_path}/**/libpisoundmicro.*", recursive=True):
-		lib_dir = os.path.dirname(lib_glob)
-		if lib_dir not in lib_paths:
-			lib_paths.append(lib_dir)
+	lib_dir = next((str(p.parent) for p in Path(search_path).rglob('libpisoundmicro.*')), None)
+	if lib_dir is not None and lib_dir not in lib_paths:
+		lib_paths.append(lib_dir)
 
 if '--owner=root' in sys.argv:
 	sys.argv.remove('--owner=root')
 if '--group=root' in sys.argv:
 	sys.argv.remove('--group=root')
 
+# This pattern removes the copy_doc decorator function definition
+_COPY_DOC_RE = re.compile(
+	r"def copy_doc\(from_func\):\n\s+def decorator\(to_func\):.+?return decorator\n\n",
+	re.DOTALL
+)
+
 class DocstringInjector(ast.NodeTransformer):
-	def __init__(self, psm_module):
+	def __init__(self, psm_module, doc_cache=None):
 		self.psm = psm_module
 		self.modified = False
 		self.processed_count = 0
+		# copy_doc target path -> docstring, may be shared between files
+		self._doc_cache = doc_cache if doc_cache is not None else {}
 
 	def visit_FunctionDef(self, node):
+		self._inject_docstring(node)
+		return self.generic_visit(node)
+
+	def visit_ClassDef(self, node):
+		self._inject_docstring(node)
+		return self.generic_visit(node)
+
+	def _inject_docstring(self, node):
 		# Process decorators
 		copy_doc_target = None
 		new_decorators = []
@@ -56,31 +72,38 @@ class DocstringInjector(ast.NodeTransformer):
 		# If we found a copy_doc decorator, apply the docstring
 		if copy_doc_target:
 			try:
-				# Navigate to source object and get its docstring
-				obj = self.psm
-				for part in copy_doc_target.split('.'):
-					obj = getattr(obj, part)
+				docstring = self._doc_cache.get(copy_doc_target)
+				if docstring is None:
+					# Navigate to source object and get its docstring
+					obj = self.psm
+					for part in copy_doc_target.split('.'):
+						obj = getattr(obj, part)
 
-				docstring = obj.__doc__ or ''
+					docstring = self._doc_cache[copy_doc_target] = obj.__doc__ or ''
 
-				# Set the docstring on the function
-				node.body = [ast.Expr(value=ast.Constant(value=docstring))] + node.body
+				# Set the docstring, replacing the existing one, same as copy_doc would at runtime
+				doc_node = ast.Expr(value=ast.Constant(value=docstring))
+				if ast.get_docstring(node, clean=False) is not None:
+					node.body[0] = doc_node
+				else:
+					node.body = [doc_node] + node.body
 				self.processed_count += 1
 				print(f"Copied docstring from {copy_doc_target} to {node.name}")
 			except Exception as e:
 				print(f"Error copying docstring for {node.name}: {e}")
 
-		return self.generic_visit(node)
-
 	def _extract_attribute_path(self, node):
 		"""Extract the full attribute path (e.g., psm.Audio.init)"""
-		if isinstance(node, ast.Name):
-			return node.id
-		elif isinstance(node, ast.Attribute):
-			return f"{self._extract_attribute_path(node.value)}.{node.attr}"
-		return ""
+		parts = []
+		while isinstance(node, ast.Attribute):
+			parts.append(node.attr)
+			node = node.value
+		if not isinstance(node, ast.Name):
+			return ""
+		parts.append(node.id)
+		return '.'.join(reversed(parts))
 
-def preprocess_single_file(file_path, dest_file, psm_module):
+def preprocess_single_file(file_path, dest_file, psm_module, doc_cache=None):
 	"""
 	Preprocess a single Python file by injecting docstrings from SWIG module.
 	
@@ -88,6 +111,7 @@ def preprocess_single_file(file_path, dest_file, psm_module):
 		file_path: Path to the source Python file
 		dest_file: Path where the processed file will be written
 		psm_module: The imported SWIG module with docstrings
+		doc_cache: Optional dict of already resolved docstrings, shared between files
 		
 	Returns:
 		int: Number of docstrings processed
@@ -95,12 +119,18 @@ def preprocess_single_file(file_path, dest_file, psm_module):
 	# Read the source file
 	with open(file_path, 'r') as f:
 		source = f.read()
+
+	# Nothing to inject, copy the file as is, skipping the parse/unparse round trip
+	if 'copy_doc' not in source:
+		os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+		shutil.copy2(file_path, dest_file)
+		return 0
 	
 	# Parse the source into an AST
 	tree = ast.parse(source)
 	
 	# Apply the docstring injector
-	transformer = DocstringInjector(psm_module)
+	transformer = DocstringInjector(psm_module, doc_cache)
 	modified_tree = transformer.visit(tree)
 	ast.fix_missing_locations(modified_tree)
 	
@@ -109,14 +139,7 @@ def preprocess_single_file(file_path, dest_file, psm_module):
 
 	# If copy_doc was used in this file, remove the decorator definition
 	if transformer.modified:
-		# This pattern removes the copy_doc decorator function definition
-		import re
-		modified_source = re.sub(
-			r"def copy_doc\(from_func\):\n\s+def decorator\(to_func\):.+?return decorator\n\n",
-			"",
-			modified_source,
-			flags=re.DOTALL
-		)
+		modified_source = _COPY_DOC_RE.sub("", modified_source)
 
 	# Create destination directory if needed
 	os.makedirs(os.path.dirname(dest_file), exist_ok=True)
@@ -129,57 +152,57 @@ def preprocess_single_file(file_path, dest_file, psm_module):
 
 def find_and_preprocess_files(self):
 	"""
-	Find all Python files in pypisoundmicro/ (excluding swig/) and preprocess them.
+	Find all Python files in pypisoundmicro/ (excluding swig/) that need preprocessing.
 	
-	Returns:
-		tuple: (number of files processed, total number of docstrings injected)
+	Yields:
+		str: Path of each Python file, as it is found
 	"""
 	print("Finding and preprocessing Python files in pypisoundmicro/...")
 	
 	# Find all Python files in pypisoundmicro/ but not in pypisoundmicro/swig/
 	source_dir = 'pypisoundmicro'
-	py_files = []
 	for root, dirs, files in os.walk(source_dir):
-		if 'swig' in root.split(os.path.sep):
-			continue  # Skip swig subdirectory
+		if 'swig' in dirs:
+			dirs.remove('swig')  # Skip swig subdirectory
 		for file in files:
 			if file.endswith('.py') and not file.startswith('__'):
-				py_files.append(os.path.join(root, file))
-	
-	return py_files
+				yield os.path.join(root, file)
 
 def preprocess_python_files(self):
 	print("Preprocessing Python files in pypisoundmicro/ to inject docstrings...")
+	sys.path.insert(0, self.build_lib)
 	try:
 		# Find the built SWIG module
-		build_dirs = glob.glob(os.path.join(self.build_lib, 'pypisoundmicro', 'swig', '_pypisoundmicro*.so'))
-		if not build_dirs:
+		try:
+			swig_spec = importlib.util.find_spec('pypisoundmicro.swig._pypisoundmicro')
+		except ModuleNotFoundError:
+			swig_spec = None
+		if swig_spec is None:
 			print("Warning: Could not find built SWIG module, skipping docstring injection")
 			return
 
 		# Import the SWIG module to access docstrings
-		sys.path.insert(0, self.build_lib)
 		from pypisoundmicro.swig import pypisoundmicro as psm
 
-		# Find Python files to process
-		py_files = find_and_preprocess_files(self)
-		
+		file_count = 0
 		processed_total = 0
+		doc_cache = {}
 		
-		# Process each file
-		for py_file in py_files:
+		# Process each file as it is found
+		for py_file in find_and_preprocess_files(self):
 			# Define the destination file path
 			rel_path = os.path.relpath(py_file, start='.')
 			dest_file = os.path.join(self.build_lib, rel_path)
 			
 			 # Process the file
-			processed_count = preprocess_single_file(py_file, dest_file, psm)
+			processed_count = preprocess_single_file(py_file, dest_file, psm, doc_cache)
 			
+			file_count += 1
 			processed_total += processed_count
 			if processed_count > 0:
 				print(f"Injected {processed_count} docstrings into {rel_path}")
 
-		print(f"Successfully processed {len(py_files)} files with {processed_total} total docstrings injected")
+		print(f"Successfully processed {file_count} files with {processed_total} total docstrings injected")
 
 	except Exception as e:
 		print(f"Error preprocessing Python files with AST: {e}")
@@ -192,6 +215,8 @@ def preprocess_python_files(self):
 				dest_file = os.path.join(self.build_lib, rel_path)
 				os.makedirs(os.path.dirname(dest_file), exist_ok=True)
 				shutil.copy2(py_file, dest_file)
+	finally:
+		sys.path.remove(self.build_lib)
 
 # Custom build_py command to preprocess Python files
 class CustomBuildPy(build_py):
@@ -225,6 +250,10 @@ setup(
 	url='https://blokas.io/',
 	license='LGPLv3',
 	ext_modules=[pisoundmicro_module],
+	extras_require={
+		'dsp': [ 'numpy' ],
+		'jit': [ 'numpy', 'numba' ],
+	},
 	py_modules=['pypisoundmicro'],
 	cmdclass={
 		'build_py': CustomBuildPy,
@@ -18,17 +18,29 @@
 # You should have received a copy of the GNU Lesser General Public License along with libpisoundmicro. If not, see <https://www.gnu.org/licenses/>.
 
 import unittest
+import atexit
+import errno
+import fcntl
 import os
-import random
 import signal
 import string
 import sys
 import time
+from array import array
 import pypisoundmicro as psm
 from pypisoundmicro import (Pin, ElementType, PinPull, PinDirection, ActivityType,
 						   ValueMode, ElementName, Element, Setup, ValueFd, Range)
+from pypisoundmicro.analoginput import AnalogInputOpts
+from pypisoundmicro.encoder import EncoderOpts
+from pypisoundmicro import valuefd
 from pypisoundmicro.swig import pypisoundmicro as swig_psm
 
+try:
+	import numpy as np
+	from pypisoundmicro import dsp
+except ImportError:
+	np = None
+
 # Signal handler for clean shutdown during abnormal termination
 def signal_handler(signum, frame):
 	print(f"\nReceived signal {signum}. Cleaning up resources...")
@@ -36,13 +48,49 @@ def signal_handler(signum, frame):
 	print("Cleanup complete. Exiting.")
 	sys.exit(1)
 
-# Register the handler for common termination signals
-signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C
-signal.signal(signal.SIGTERM, signal_handler)  # Termination signal
+# Clean up on normal interpreter exit, also when the module is run by another test runner.
+atexit.register(psm.cleanup)
+
+_SYSFS_BASE = '/sys/pisound-micro'
+
+# Whether the library initialized and the Pisound Micro sysfs interface is present, set by setUpModule.
+HAS_HW = False
+_lib_initialized = False
+
+def setUpModule():
+	global HAS_HW, _lib_initialized
+	# Initialize the library once for the whole test run, probing for the hardware only once.
+	_lib_initialized = swig_psm.upisnd_init() == 0
+	HAS_HW = _lib_initialized and os.path.isdir(_SYSFS_BASE)
+
+def tearDownModule():
+	if _lib_initialized:
+		swig_psm.upisnd_uninit()
+
+# Maps every byte value onto a lowercase letter, so random bytes can be turned into a name in one go.
+_NAME_TABLE = bytes(ord(string.ascii_lowercase[i % len(string.ascii_lowercase)]) for i in range(256))
 
 def random_string(length=8):
 	"""Generate a random string for test element names."""
-	return ''.join(random.choice(string.ascii_lowercase) for i in range(length))
+	return os.urandom(length).translate(_NAME_TABLE).decode('ascii')
+
+# Pin-using test classes take this lock, so they stay serialized when the suite runs in parallel processes.
+_HW_LOCK_PATH = '/tmp/pisound_micro_tests.lock'
+
+class HardwareTestCase(unittest.TestCase):
+	"""Base class for tests that set up elements on the Pisound Micro pins."""
+	
+	@classmethod
+	def setUpClass(cls):
+		# Checked here rather than with a skip decorator, as HAS_HW is only known after setUpModule.
+		if not HAS_HW:
+			raise unittest.SkipTest("Pisound Micro hardware not available")
+		cls._hw_lock = open(_HW_LOCK_PATH, 'w')
+		cls.addClassCleanup(cls._hw_lock.close)
+		fcntl.flock(cls._hw_lock, fcntl.LOCK_EX)
+		# Class cleanups also run when a subclass setUpClass fails after this, unlike tearDownClass.
+		cls.addClassCleanup(fcntl.flock, cls._hw_lock, fcntl.LOCK_UN)
+
 
 class TestLibInitialization(unittest.TestCase):
 	"""Test the initialization and uninitialization of the library."""
@@ -75,15 +123,9 @@ class TestElementName(unittest.TestCase):
 		self.assertTrue(str(name).startswith(prefix))
 
 
-class TestElement(unittest.TestCase):
+class TestElement(HardwareTestCase):
 	"""Test the Element base class."""
 	
-	def setUp(self):
-		swig_psm.upisnd_init()
-	
-	def tearDown(self):
-		swig_psm.upisnd_uninit()
-	
 	def test_element_constructor(self):
 		element = Element()
 		self.assertFalse(element.is_valid)
@@ -113,51 +155,60 @@ class TestElement(unittest.TestCase):
 		self.assertIsNone(element)
 
 
-class TestValueFd(unittest.TestCase):
+class TestValueFd(HardwareTestCase):
 	"""Test the ValueFd class."""
 	
 	def setUp(self):
-		swig_psm.upisnd_init()
-		
+		self.element = None
+		self.fd = None
+
 		# Set up a GPIO output element for testing
 		self.element_name = f"test_valuefd_{random_string()}"
 		setup = Setup.for_gpio_output(Pin.B03, False)
 		self.element = Element.setup(self.element_name, setup)
+
+		# Keep a single value fd open for all of the reads and writes of a test.
+		self.fd = self.element.open_value_fd(os.O_RDWR | os.O_CLOEXEC)
 		
 	def tearDown(self):
-		if hasattr(self, 'element') and self.element and self.element.is_valid:
+		if self.fd is not None:
+			self.fd.close()
+		if self.element is not None and self.element.is_valid:
 			self.element.release()
-		swig_psm.upisnd_uninit()
 	
 	def test_valuefd_read_write(self):
-		# Open a ValueFd for the element
-		fd = self.element.open_value_fd(os.O_RDWR | os.O_CLOEXEC)
-		self.assertIsNotNone(fd)
-		self.assertTrue(fd.is_valid())
+		self.assertIsNotNone(self.fd)
+		self.assertTrue(self.fd.is_valid)
 		
 		# Write a value
-		result = fd.write(1)
+		result = self.fd.write(1)
 		self.assertGreater(result, 0)
 		
 		# Read the value back
-		value = fd.read()
+		value = self.fd.read()
 		self.assertEqual(value, 1)
 		
 		# Write another value
-		result = fd.write(0)
+		result = self.fd.write(0)
 		self.assertGreater(result, 0)
 		
 		# Read again
-		value = fd.read()
+		value = self.fd.read()
 		self.assertEqual(value, 0)
+	
+	def test_valuefd_close(self):
+		self.assertTrue(self.fd.is_valid)
 		
 		# Explicitly close the fd
-		fd.close()
-		self.assertFalse(fd.is_valid())
+		self.fd.close()
+		self.assertFalse(self.fd.is_valid)
+		
+		# Closing again is a no-op
+		self.fd.close()
 	
 	def test_valuefd_get_take(self):
 		fd = self.element.open_value_fd(os.O_RDWR | os.O_CLOEXEC)
-		self.assertTrue(fd.is_valid())
+		self.assertTrue(fd.is_valid)
 		
 		# Get the raw fd value
 		raw_fd = fd.get()
@@ -166,14 +217,14 @@ class TestValueFd(unittest.TestCase):
 		# Take ownership of the fd
 		raw_fd = fd.take()
 		self.assertGreaterEqual(raw_fd, 0)
-		self.assertFalse(fd.is_valid())
+		self.assertFalse(fd.is_valid)
 		
 		# Close the raw fd ourselves
 		os.close(raw_fd)
 	
 	def test_valuefd_destruction(self):
 		fd = self.element.open_value_fd(os.O_RDWR | os.O_CLOEXEC)
-		self.assertTrue(fd.is_valid())
+		self.assertTrue(fd.is_valid)
 		
 		# Get the raw fd value
 		raw_fd = fd.get()
@@ -181,22 +232,94 @@ class TestValueFd(unittest.TestCase):
 		# Delete the ValueFd object, which should close the fd
 		del fd
 		
-		# Try to use the fd, which should fail if it was closed
-		try:
-			os.write(raw_fd, b"test")
-			self.fail("File descriptor should be closed")
-		except OSError:
-			pass  # Expected behavior
+		# Look up the fd, which should fail if it was closed
+		with self.assertRaises(OSError):
+			fcntl.fcntl(raw_fd, fcntl.F_GETFD)
 
 
-class TestGPIO(unittest.TestCase):
-	"""Test GPIO functionality."""
+class TestClosedValueFd(unittest.TestCase):
+	"""Test ValueFd behavior once closed, using a pipe instead of an element."""
 	
 	def setUp(self):
-		swig_psm.upisnd_init()
+		read_fd, self.write_fd = os.pipe()
+		self.fd = ValueFd(read_fd)
+		self.fd.close()
 	
 	def tearDown(self):
-		swig_psm.upisnd_uninit()
+		os.close(self.write_fd)
+	
+	def test_read_closed(self):
+		with self.assertRaises(OSError) as ctx:
+			self.fd.read()
+		self.assertEqual(ctx.exception.errno, errno.EBADF)
+	
+	def test_read_into_closed(self):
+		with self.assertRaises(OSError) as ctx:
+			self.fd.read_into(array('H', [0]))
+		self.assertEqual(ctx.exception.errno, errno.EBADF)
+
+
+class TestValueFdPool(unittest.TestCase):
+	"""Test reuse of ValueFd objects through ValueFd.acquire."""
+	
+	def setUp(self):
+		self.pipe = os.pipe()
+		valuefd._pool.clear()
+	
+	def tearDown(self):
+		valuefd._pool.clear()
+		for fd in self.pipe:
+			try:
+				os.close(fd)
+			except OSError:
+				pass
+	
+	def test_close_returns_to_pool(self):
+		fd = ValueFd.acquire(os.dup(self.pipe[0]))
+		fd.close()
+		self.assertIn(fd, valuefd._pool)
+		
+		reused = ValueFd.acquire(os.dup(self.pipe[0]))
+		self.assertIs(reused, fd)
+		self.assertTrue(reused.is_valid)
+		reused.close()
+	
+	def test_del_does_not_pool(self):
+		fd = ValueFd.acquire(os.dup(self.pipe[0]))
+		del fd
+		self.assertEqual(len(valuefd._pool), 0)
+	
+	def test_subclass_not_pooled(self):
+		class SubValueFd(ValueFd):
+			__slots__ = ()
+		
+		fd = SubValueFd.acquire(os.dup(self.pipe[0]))
+		self.assertIsInstance(fd, SubValueFd)
+		fd.close()
+		self.assertEqual(len(valuefd._pool), 0)
+		
+		plain = ValueFd.acquire(os.dup(self.pipe[0]))
+		self.assertIs(type(plain), ValueFd)
+		plain.close()
+
+
+class TestGPIO(HardwareTestCase):
+	"""Test GPIO functionality."""
+	
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# Elements shared by the tests of the class, keyed by (kind, pin), set up only once.
+		# Each release is a class cleanup, so it runs before the hardware lock is dropped,
+		# even if setting up a later element raises.
+		cls._pool = {}
+		gpio = psm.Gpio.setup_output(f"test_gpio_pool_{random_string()}", Pin.B05, False)
+		cls.addClassCleanup(gpio.release)
+		cls._pool[('gpio_out', Pin.B05)] = gpio
+	
+	def tearDown(self):
+		# Reset the pooled outputs for the next test.
+		self._pool[('gpio_out', Pin.B05)].set_value(False)
 	
 	def test_gpio_input(self):
 		name = f"test_gpio_input_{random_string()}"
@@ -214,11 +337,10 @@ class TestGPIO(unittest.TestCase):
 		gpio.release()
 	
 	def test_gpio_output(self):
-		name = f"test_gpio_output_{random_string()}"
-		gpio = psm.Gpio.setup_output(name, Pin.B05, False)
+		gpio = self._pool[('gpio_out', Pin.B05)]
 		
 		self.assertTrue(gpio.is_valid)
-		self.assertEqual(gpio.name, name)
+		self.assertTrue(gpio.name.startswith("test_gpio_pool_"))
 		self.assertEqual(gpio.direction, PinDirection.OUTPUT)  # Using property
 		
 		# Set to high and check
@@ -228,8 +350,6 @@ class TestGPIO(unittest.TestCase):
 		# Set to low and check
 		gpio.set_value(False)
 		self.assertEqual(gpio.get_value(), 0)
-		
-		gpio.release()
 	
 	def test_as_gpio(self):
 		name = f"test_as_gpio_{random_string()}"
@@ -247,15 +367,9 @@ class TestGPIO(unittest.TestCase):
 		gpio.release()
 
 
-class TestAnalogInput(unittest.TestCase):
+class TestAnalogInput(HardwareTestCase):
 	"""Test AnalogInput functionality."""
 	
-	def setUp(self):
-		swig_psm.upisnd_init()
-	
-	def tearDown(self):
-		swig_psm.upisnd_uninit()
-	
 	def test_analog_input_setup(self):
 		name = f"test_analog_{random_string()}"
 		adc = psm.AnalogInput.setup(name, Pin.B23)
@@ -297,6 +411,30 @@ class TestAnalogInput(unittest.TestCase):
 		
 		adc.release()
 	
+	def test_analog_input_read_into_signed(self):
+		name = f"test_analog_signed_{random_string()}"
+		adc = psm.AnalogInput.setup(name, Pin.B24)
+		
+		# Map onto a negative value range, which doesn't fit unsigned items
+		opts = adc.get_opts()
+		opts.input_range = Range(0, 1023)
+		opts.value_range = Range(-200, -100)
+		adc.set_opts(opts)
+		
+		for fmt in ('h', 'i'):
+			samples = array(fmt, [0] * 4)
+			self.assertEqual(adc.read_into(samples), 4)
+			for value in samples:
+				self.assertGreaterEqual(value, -200)
+				self.assertLessEqual(value, -100)
+		
+		with self.assertRaises(OverflowError):
+			adc.read_into(array('H', [0] * 4))
+		with self.assertRaises(TypeError):
+			adc.read_into(array('d', [0] * 4))
+		
+		adc.release()
+	
 	def test_as_analog_input(self):
 		name = f"test_as_analog_{random_string()}"
 		element = Element.setup(name, Setup.for_analog_input(Pin.B25))
@@ -313,15 +451,9 @@ class TestAnalogInput(unittest.TestCase):
 		adc.release()
 
 
-class TestEncoder(unittest.TestCase):
+class TestEncoder(HardwareTestCase):
 	"""Test Encoder functionality."""
 	
-	def setUp(self):
-		swig_psm.upisnd_init()
-	
-	def tearDown(self):
-		swig_psm.upisnd_uninit()
-	
 	def test_encoder_setup(self):
 		name = f"test_encoder_{random_string()}"
 		encoder = psm.Encoder.setup(name, Pin.B03, PinPull.UP, Pin.B04, PinPull.UP)
@@ -357,6 +489,28 @@ class TestEncoder(unittest.TestCase):
 		
 		encoder.release()
 	
+	def test_encoder_burst_read(self):
+		name = f"test_enc_burst_{random_string()}"
+		encoder = psm.Encoder.setup(name, Pin.B03, PinPull.UP, Pin.B04, PinPull.UP)
+		encoder.set_opts(EncoderOpts.from_values(-1000, 1000, -1000, 1000, ValueMode.CLAMP))
+		
+		# Read a burst of values through a single fd held open, in one native call
+		fd = encoder.open_value_fd(os.O_RDONLY | os.O_CLOEXEC)
+		self.assertIsNotNone(fd)
+		values = ValueFd.read_batch([fd] * 100)
+		fd.close()
+		
+		self.assertEqual(len(values), 100)
+		for value in values:
+			self.assertGreaterEqual(value, -1000)
+			self.assertLessEqual(value, 1000)
+		
+		# Any movement during the burst goes in a single direction
+		steps = [b - a for a, b in zip(values, values[1:])]
+		self.assertTrue(all(d >= 0 for d in steps) or all(d <= 0 for d in steps))
+		
+		encoder.release()
+	
 	def test_as_encoder(self):
 		name = f"test_as_encoder_{random_string()}"
 		setup = Setup.for_encoder(Pin.B07, PinPull.UP, Pin.B08, PinPull.UP)
@@ -370,15 +524,9 @@ class TestEncoder(unittest.TestCase):
 		encoder.release()
 
 
-class TestActivity(unittest.TestCase):
+class TestActivity(HardwareTestCase):
 	"""Test Activity functionality."""
 	
-	def setUp(self):
-		swig_psm.upisnd_init()
-	
-	def tearDown(self):
-		swig_psm.upisnd_uninit()
-	
 	def test_activity_setup(self):
 		name = f"test_activity_{random_string()}"
 		activity = psm.Activity.setup_activity(name, Pin.B09, ActivityType.MIDI_INPUT)
@@ -404,102 +552,255 @@ class TestActivity(unittest.TestCase):
 		activity.release()
 
 
+class TestOpts(unittest.TestCase):
+	"""Test packing and unpacking of the AnalogInput and Encoder options."""
+	
+	def test_analog_input_opts_set_ranges_unpack(self):
+		opts = AnalogInputOpts()
+		self.assertEqual(opts.input_range, Range(0, 1023))  # Primes the cached ranges
+		
+		opts.set_ranges(-100, 100, -10, 10)
+		self.assertEqual(opts.input_range, Range(-100, 100))
+		self.assertEqual(opts.value_range, Range(-10, 10))
+		self.assertEqual(opts.unpack(), (-100, 100, -10, 10))
+		self.assertEqual(opts.to_c_opts().value_range.low, -10)
+	
+	def test_analog_input_opts_unpack_refreshes_cache(self):
+		opts = AnalogInputOpts.from_values(0, 1023, 0, 100)
+		self.assertEqual(opts.value_range, Range(0, 100))
+		
+		# Modify the C struct directly, unpack picks up the change
+		opts.to_c_opts().value_range.high = 50
+		self.assertEqual(opts.unpack(), (0, 1023, 0, 50))
+		self.assertEqual(opts.value_range, Range(0, 50))
+	
+	def test_analog_input_opts_bytes(self):
+		opts = AnalogInputOpts.from_values(1, 2, 3, 4)
+		copy = AnalogInputOpts.from_bytes(opts.to_bytes())
+		self.assertEqual(copy.input_range, Range(1, 2))
+		self.assertEqual(copy.value_range, Range(3, 4))
+		
+		with self.assertRaises(ValueError):
+			AnalogInputOpts.from_bytes(b'\x00')
+	
+	def test_encoder_opts_pack_unpack(self):
+		opts = EncoderOpts()
+		self.assertEqual(opts.value_range, Range(0, 100))  # Primes the cached ranges
+		
+		opts.pack(-10, 10, 0, 100, ValueMode.WRAP)
+		self.assertEqual(opts.input_range, Range(-10, 10))
+		self.assertEqual(opts.value_range, Range(0, 100))
+		self.assertEqual(opts.value_mode, ValueMode.WRAP)
+		self.assertEqual(opts.unpack(), (-10, 10, 0, 100, ValueMode.WRAP))
+	
+	def test_encoder_opts_bytes(self):
+		opts = EncoderOpts.from_values(-5, 5, 10, 20, ValueMode.CLAMP)
+		copy = EncoderOpts.from_bytes(opts.to_bytes())
+		self.assertEqual(copy.unpack(), (-5, 5, 10, 20, ValueMode.CLAMP))
+		
+		with self.assertRaises(ValueError):
+			EncoderOpts.from_bytes(opts.to_bytes() + b'\x00')
+
+
 class TestSetup(unittest.TestCase):
 	"""Test Setup functionality."""
 	
+	@classmethod
+	def setUpClass(cls):
+		# Build each Setup once, along with its integer value, for all of the tests.
+		cls.gpio_in = Setup.for_gpio_input(Pin.B03, PinPull.UP)
+		cls.gpio_in_i = cls.gpio_in.to_int()
+		cls.gpio_out = Setup.for_gpio_output(Pin.B05, True)
+		cls.gpio_out_i = cls.gpio_out.to_int()
+		cls.analog = Setup.for_analog_input(Pin.B23)
+		cls.analog_i = cls.analog.to_int()
+		cls.encoder = Setup.for_encoder(Pin.B03, PinPull.UP, Pin.B04, PinPull.UP)
+		cls.encoder_i = cls.encoder.to_int()
+		cls.activity = Setup.for_activity(Pin.B09, ActivityType.MIDI_INPUT)
+		cls.activity_i = cls.activity.to_int()
+	
 	def test_setup_for_gpio_input(self):
-		setup = Setup.for_gpio_input(Pin.B03, PinPull.UP)
-		self.assertIsNotNone(setup)
+		self.assertIsNotNone(self.gpio_in)
 		
-		element_type = swig_psm.upisnd_setup_get_element_type(setup.to_int())
+		element_type = swig_psm.upisnd_setup_get_element_type(self.gpio_in_i)
 		self.assertEqual(element_type, ElementType.GPIO)
 		
-		pin = swig_psm.upisnd_setup_get_pin_id(setup.to_int())
+		pin = swig_psm.upisnd_setup_get_pin_id(self.gpio_in_i)
 		self.assertEqual(pin, Pin.B03)
 		
-		direction = swig_psm.upisnd_setup_get_gpio_dir(setup.to_int())
+		direction = swig_psm.upisnd_setup_get_gpio_dir(self.gpio_in_i)
 		self.assertEqual(direction, PinDirection.INPUT)
 		
-		pull = swig_psm.upisnd_setup_get_gpio_pull(setup.to_int())
+		pull = swig_psm.upisnd_setup_get_gpio_pull(self.gpio_in_i)
 		self.assertEqual(pull, PinPull.UP)
 	
 	def test_setup_for_gpio_output(self):
-		setup = Setup.for_gpio_output(Pin.B05, True)
-		self.assertIsNotNone(setup)
+		self.assertIsNotNone(self.gpio_out)
 		
-		element_type = swig_psm.upisnd_setup_get_element_type(setup.to_int())
+		element_type = swig_psm.upisnd_setup_get_element_type(self.gpio_out_i)
 		self.assertEqual(element_type, ElementType.GPIO)
 		
-		pin = swig_psm.upisnd_setup_get_pin_id(setup.to_int())
+		pin = swig_psm.upisnd_setup_get_pin_id(self.gpio_out_i)
 		self.assertEqual(pin, Pin.B05)
 		
-		direction = swig_psm.upisnd_setup_get_gpio_dir(setup.to_int())
+		direction = swig_psm.upisnd_setup_get_gpio_dir(self.gpio_out_i)
 		self.assertEqual(direction, PinDirection.OUTPUT)
 		
-		output = swig_psm.upisnd_setup_get_gpio_output(setup.to_int())
+		output = swig_psm.upisnd_setup_get_gpio_output(self.gpio_out_i)
 		self.assertEqual(output, 1)  # 1 for True
 	
 	def test_setup_for_analog_input(self):
-		setup = Setup.for_analog_input(Pin.B23)
-		self.assertIsNotNone(setup)
+		self.assertIsNotNone(self.analog)
 		
-		element_type = swig_psm.upisnd_setup_get_element_type(setup.to_int())
+		element_type = swig_psm.upisnd_setup_get_element_type(self.analog_i)
 		self.assertEqual(element_type, ElementType.ANALOG_INPUT)
 		
-		pin = swig_psm.upisnd_setup_get_pin_id(setup.to_int())
+		pin = swig_psm.upisnd_setup_get_pin_id(self.analog_i)
 		self.assertEqual(pin, Pin.B23)
 	
 	def test_setup_for_encoder(self):
-		setup = Setup.for_encoder(Pin.B03, PinPull.UP, Pin.B04, PinPull.UP)
-		self.assertIsNotNone(setup)
+		self.assertIsNotNone(self.encoder)
 		
-		element_type = swig_psm.upisnd_setup_get_element_type(setup.to_int())
+		element_type = swig_psm.upisnd_setup_get_element_type(self.encoder_i)
 		self.assertEqual(element_type, ElementType.ENCODER)
 		
-		pin_a = swig_psm.upisnd_setup_get_pin_id(setup.to_int())
+		pin_a = swig_psm.upisnd_setup_get_pin_id(self.encoder_i)
 		self.assertEqual(pin_a, Pin.B03)
 		
-		pull_a = swig_psm.upisnd_setup_get_gpio_pull(setup.to_int())
+		pull_a = swig_psm.upisnd_setup_get_gpio_pull(self.encoder_i)
 		self.assertEqual(pull_a, PinPull.UP)
 		
-		pin_b = swig_psm.upisnd_setup_get_encoder_pin_b_id(setup.to_int())
+		pin_b = swig_psm.upisnd_setup_get_encoder_pin_b_id(self.encoder_i)
 		self.assertEqual(pin_b, Pin.B04)
 		
-		pull_b = swig_psm.upisnd_setup_get_encoder_pin_b_pull(setup.to_int())
+		pull_b = swig_psm.upisnd_setup_get_encoder_pin_b_pull(self.encoder_i)
 		self.assertEqual(pull_b, PinPull.UP)
 	
 	def test_setup_for_activity(self):
-		setup = Setup.for_activity(Pin.B09, ActivityType.MIDI_INPUT)
-		self.assertIsNotNone(setup)
+		self.assertIsNotNone(self.activity)
 		
-		element_type = swig_psm.upisnd_setup_get_element_type(setup.to_int())
+		element_type = swig_psm.upisnd_setup_get_element_type(self.activity_i)
 		self.assertEqual(element_type, ElementType.ACTIVITY)
 		
-		pin = swig_psm.upisnd_setup_get_pin_id(setup.to_int())
+		pin = swig_psm.upisnd_setup_get_pin_id(self.activity_i)
 		self.assertEqual(pin, Pin.B09)
 		
-		activity_type = swig_psm.upisnd_setup_get_activity_type(setup.to_int())
+		activity_type = swig_psm.upisnd_setup_get_activity_type(self.activity_i)
 		self.assertEqual(activity_type, ActivityType.MIDI_INPUT)
+	
+	def test_setup_int(self):
+		self.assertEqual(int(self.gpio_in), self.gpio_in_i)
+		self.assertEqual(int(Setup.from_int(self.encoder_i)), self.encoder_i)
+	
+	def test_setup_layout(self):
+		# The Setup properties decode the fields in Python, they must agree with the native getters.
+		probes = (
+			self.gpio_in, self.gpio_out, self.analog, self.encoder, self.activity,
+			Setup.for_encoder(Pin.B03, PinPull.NONE, Pin.B04, PinPull.DOWN),
+			Setup.for_gpio_input(Pin.B05, PinPull.DOWN),
+			Setup.for_gpio_output(Pin.B06, False),
+			Setup.for_activity(Pin.B07, ActivityType.MIDI_OUTPUT),
+			Setup(),
+		)
+		for probe in probes:
+			native = probe.to_int()
+			with self.subTest(setup=hex(native)):
+				self.assertEqual(probe.element_type, swig_psm.upisnd_setup_get_element_type(native))
+				self.assertEqual(probe.pin, swig_psm.upisnd_setup_get_pin_id(native))
+				self.assertEqual(probe.gpio_direction, swig_psm.upisnd_setup_get_gpio_dir(native))
+				self.assertEqual(probe.gpio_pull, swig_psm.upisnd_setup_get_gpio_pull(native))
+				self.assertEqual(probe.gpio_output, swig_psm.upisnd_setup_get_gpio_output(native))
+				self.assertEqual(probe.encoder_pin_b, swig_psm.upisnd_setup_get_encoder_pin_b_id(native))
+				self.assertEqual(probe.encoder_pin_b_pull, swig_psm.upisnd_setup_get_encoder_pin_b_pull(native))
+				self.assertEqual(probe.activity_type, swig_psm.upisnd_setup_get_activity_type(native))
+	
+	def test_setup_properties(self):
+		self.assertEqual(self.gpio_in.element_type, ElementType.GPIO)
+		self.assertEqual(self.gpio_in.pin, Pin.B03)
+		self.assertEqual(self.gpio_in.gpio_direction, PinDirection.INPUT)
+		self.assertEqual(self.gpio_in.gpio_pull, PinPull.UP)
+		self.assertEqual(self.gpio_out.gpio_direction, PinDirection.OUTPUT)
+		self.assertEqual(self.gpio_out.gpio_output, 1)
+		self.assertEqual(self.analog.element_type, ElementType.ANALOG_INPUT)
+		self.assertEqual(self.analog.pin, Pin.B23)
+		self.assertEqual(self.activity.activity_type, ActivityType.MIDI_INPUT)
+		
+		encoder = Setup.for_encoder(Pin.B03, PinPull.UP, Pin.B04, PinPull.DOWN)
+		self.assertEqual(encoder.element_type, ElementType.ENCODER)
+		self.assertEqual(encoder.pin, Pin.B03)
+		self.assertEqual(encoder.gpio_pull, PinPull.UP)
+		self.assertEqual(encoder.encoder_pin_b, Pin.B04)
+		self.assertEqual(encoder.encoder_pin_b_pull, PinPull.DOWN)
+	
+	def test_setup_properties_invalid(self):
+		# Fields not belonging to the element type read back as invalid.
+		self.assertEqual(self.gpio_in.gpio_output, -errno.EINVAL)
+		self.assertEqual(self.gpio_in.encoder_pin_b, Pin.INVALID)
+		self.assertEqual(self.gpio_in.encoder_pin_b_pull, PinPull.INVALID)
+		self.assertEqual(self.gpio_in.activity_type, ActivityType.INVALID)
+		self.assertEqual(self.gpio_out.gpio_pull, PinPull.INVALID)
+		self.assertEqual(self.analog.gpio_direction, PinDirection.INVALID)
+		self.assertEqual(self.analog.gpio_pull, PinPull.INVALID)
+		self.assertEqual(self.encoder.gpio_direction, PinDirection.INVALID)
+		self.assertEqual(self.encoder.activity_type, ActivityType.INVALID)
+		self.assertEqual(self.activity.encoder_pin_b, Pin.INVALID)
+		self.assertEqual(Setup().pin, Pin.INVALID)
+	
+	def test_setup_bytes(self):
+		data = self.encoder.to_bytes()
+		self.assertEqual(len(data), 4)
+		self.assertEqual(int.from_bytes(data, 'little'), self.encoder_i)
+		
+		setup = Setup.from_bytes(data)
+		self.assertEqual(setup.to_int(), self.encoder_i)
+		self.assertEqual(setup.encoder_pin_b, Pin.B04)
+		self.assertEqual(Setup.from_bytes(self.activity.to_bytes()).activity_type, ActivityType.MIDI_INPUT)
+
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestScaleWrap(unittest.TestCase):
+	"""Test both scale_wrap implementations against hand computed results."""
+	
+	def check(self, raw, input_low, input_high, value_low, value_high, mode, expected):
+		raw = np.array(raw, np.uint16)
+		for impl in (dsp._scale_wrap_numpy, dsp._scale_wrap_loop):
+			with self.subTest(impl=impl.__name__):
+				result = impl(raw, input_low, input_high, value_low, value_high, int(mode))
+				self.assertEqual(result.dtype, np.int32)
+				self.assertEqual(result.tolist(), expected)
+	
+	def test_scale(self):
+		self.check([0, 512, 1023], 0, 1023, 0, 100, ValueMode.CLAMP, [0, 50, 100])
+	
+	def test_clamp(self):
+		self.check([0, 150, 1023], 100, 200, 0, 10, ValueMode.CLAMP, [0, 5, 10])
+	
+	def test_wrap(self):
+		# -10 and 92 wrapped into the 11 values of [0, 10].
+		self.check([0, 150, 1023], 100, 200, 0, 10, ValueMode.WRAP, [1, 5, 4])
+	
+	def test_inverted_value_range(self):
+		self.check([0, 50, 100, 150], 0, 100, 10, 0, ValueMode.CLAMP, [10, 5, 0, 0])
+		self.check([0, 50, 100, 150], 0, 100, 10, 0, ValueMode.WRAP, [10, 5, 0, 6])
+	
+	def test_empty_input_range(self):
+		with self.assertRaises(ValueError):
+			dsp.scale_wrap(array('H', [0, 1]), 5, 5, 0, 100)
+	
+	def test_scale_wrap(self):
+		result = dsp.scale_wrap(array('H', [0, 512, 1023]), 0, 1023, 0, 100)
+		self.assertEqual(result.tolist(), [0, 50, 100])
 
 
 if __name__ == '__main__':
+	# Register the handler for common termination signals
+	signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C
+	signal.signal(signal.SIGTERM, signal_handler)  # Termination signal
+
 	try:
 		unittest.main()
 	except KeyboardInterrupt:
-		# This is a fallback in case the signal handler doesn't catch it
-		print("\nKeyboardInterrupt caught. Cleaning up...")
-		psm.cleanup()
-		sys.exit(1)
-	except SystemExit as e:
-		# Normal unittest exit, ensure cleanup is done
-		psm.cleanup()
-		sys.exit(e.code)
-	except Exception as e:
-		# Any other exception
-		print(f"\nUnexpected exception: {e}")
-		psm.cleanup()
 		sys.exit(1)
 	finally:
-		# One final attempt to clean up, though this might not be reached
-		# if a signal terminates the process
 		psm.cleanup()